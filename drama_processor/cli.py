@@ -444,9 +444,9 @@ def separate(
 )
 @click.option(
     '--preset',
-    default='medium',
+    default='faster',
     type=click.Choice(['ultrafast', 'superfast', 'veryfast', 'faster', 'fast', 'medium', 'slow', 'slower', 'veryslow']),
-    help='编码预设，影响速度和质量 (默认: medium)'
+    help='编码预设，影响速度和质量 (默认: faster)'
 )
 @click.option(
     '--log-level', '-l',
@@ -7,9 +7,15 @@ FFmpeg 包装器
 import json
 import re
 import subprocess
-from dataclasses import dataclass
+import threading
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import List, Optional, Callable, Dict, Any
+from typing import List, Optional, Callable, Dict, Any, Tuple
+
+
+# 让 FFmpeg 把进度以 key=value 行输出到 stdout（并关闭 stderr 上的统计行），
+# execute 按 '=' 拆分即可得到进度，无需对 stderr 逐行做正则匹配
+PROGRESS_OPTIONS = ['-progress', 'pipe:1', '-nostats']
 
 
 @dataclass
@@ -19,11 +25,17 @@ class FFmpegCommand:
     Attributes:
         inputs: 输入文件路径列表
         output: 输出文件路径
-        options: FFmpeg 选项列表
+        options: FFmpeg 选项列表（全局选项及 output 的输出选项）
+        extra_outputs: 额外的输出，每项为 (该输出的选项, 输出路径)，
+            依次写在 output 之后；输入只解码一次即可写出多个文件
+        input_options: 输入选项（如硬件解码），写在第一个 -i 之前，
+            只作用于第一个输入
     """
     inputs: List[Path]
     output: Path
     options: List[str]
+    extra_outputs: List[Tuple[List[str], Path]] = field(default_factory=list)
+    input_options: List[str] = field(default_factory=list)
 
 
 class FFmpegError(Exception):
@@ -40,13 +52,16 @@ class FFmpegWrapper:
     def execute(
         self, 
         command: FFmpegCommand,
-        progress_callback: Optional[Callable[[float], None]] = None
+        progress_callback: Optional[Callable[[float], None]] = None,
+        total_duration: Optional[float] = None
     ) -> None:
         """执行 FFmpeg 命令
         
         Args:
             command: FFmpeg 命令对象
             progress_callback: 可选的进度回调函数，参数为进度百分比 (0-100)
+            total_duration: 调用方已知的总时长（秒），用于计算进度；
+                           为空时探测第一个输入文件的时长
             
         Raises:
             FFmpegError: 当 FFmpeg 命令执行失败时
@@ -55,14 +70,16 @@ class FFmpegWrapper:
         cmd = self._build_command(command)
         
         # 如果有进度回调，需要获取总时长
-        total_duration = None
-        if progress_callback and command.inputs:
+        if progress_callback and not total_duration and command.inputs:
             try:
                 total_duration = self.get_video_duration(command.inputs[0])
             except Exception:
                 # 如果无法获取时长，继续执行但不报告进度
                 pass
         
+        # 命令带 -progress pipe:1 时进度在 stdout 上，否则从 stderr 解析
+        progress_on_stdout = 'pipe:1' in command.options and '-progress' in command.options
+        
         # 执行命令
         try:
             process = subprocess.Popen(
@@ -74,9 +91,27 @@ class FFmpegWrapper:
                 errors='replace'
             )
             
-            # 读取 stderr 输出（FFmpeg 将进度信息输出到 stderr）
             stderr_output = []
-            if process.stderr:
+            if progress_on_stdout:
+                # stderr 由后台线程读取，避免管道写满后 FFmpeg 阻塞
+                stderr_reader = threading.Thread(
+                    target=stderr_output.extend, args=(process.stderr,), daemon=True
+                )
+                stderr_reader.start()
+                
+                for line in process.stdout:
+                    # 解析进度信息（out_time_us=微秒数，开始时可能为 N/A）
+                    key, _, value = line.partition('=')
+                    if key == 'out_time_us' and progress_callback and total_duration:
+                        try:
+                            current_time = int(value) / 1_000_000
+                        except ValueError:
+                            continue
+                        progress_callback(min(100.0, max(0.0, current_time / total_duration * 100)))
+                
+                stderr_reader.join()
+            elif process.stderr:
+                # 读取 stderr 输出（FFmpeg 将进度信息输出到 stderr）
                 for line in process.stderr:
                     stderr_output.append(line)
                     
@@ -117,7 +152,8 @@ class FFmpegWrapper:
         """
         cmd = ['ffmpeg']
         
-        # 添加输入文件
+        # 添加输入选项和输入文件
+        cmd.extend(command.input_options)
         for input_path in command.inputs:
             cmd.extend(['-i', str(input_path)])
         
@@ -127,6 +163,11 @@ class FFmpegWrapper:
         # 添加输出文件
         cmd.append(str(command.output))
         
+        # 添加额外的输出（各自的选项写在对应输出文件之前）
+        for output_options, output_path in command.extra_outputs:
+            cmd.extend(output_options)
+            cmd.append(str(output_path))
+        
         return cmd
     
     def _parse_progress(self, line: str, total_duration: float) -> Optional[float]:
@@ -174,6 +215,8 @@ class FFmpegWrapper:
             - codec: 视频编码
             - fps: 帧率
             - bitrate: 比特率
+            - video_bitrate: 视频流比特率（容器未记录时为整体比特率）
+            - pix_fmt: 像素格式（如 yuv420p）
             
         Raises:
             FFmpegError: 当无法获取视频信息时
@@ -222,7 +265,9 @@ class FFmpegWrapper:
                 'height': int(video_stream.get('height', 0)),
                 'codec': video_stream.get('codec_name', ''),
                 'bitrate': int(format_info.get('bit_rate', 0)),
+                'pix_fmt': video_stream.get('pix_fmt', ''),
             }
+            info['video_bitrate'] = int(video_stream.get('bit_rate', 0)) or info['bitrate']
             
             # 解析帧率
             fps_str = video_stream.get('r_frame_rate', '0/1')
@@ -355,11 +400,23 @@ class OptimizedFFmpegWrapper(FFmpegWrapper):
     Attributes:
         enable_gpu: 是否启用 GPU 加速
         preset: 编码预设（ultrafast, fast, medium, slow 等）
+        tune: libx264 的 -tune 参数（如 fastdecode），None 表示不指定
+        threads: 每个编码器的线程数（-threads），0 表示自动
+        spec_presets: 按分辨率名称（如 "480p"）覆盖 preset 的编码预设
         gpu_encoder: 检测到的 GPU 编码器名称
+        gpu_scaler: NVENC 可用时检测到的 CUDA 缩放滤镜（scale_npp 或
+            scale_cuda），用于全程在显存中完成解码、缩放和编码
         gpu_info: GPU 信息字典
     """
     
-    def __init__(self, enable_gpu: bool = False, preset: str = "medium"):
+    def __init__(
+        self,
+        enable_gpu: bool = False,
+        preset: str = "medium",
+        tune: Optional[str] = None,
+        threads: int = 0,
+        spec_presets: Optional[Dict[str, str]] = None
+    ):
         """初始化优化的 FFmpeg 包装器
         
         Args:
@@ -369,12 +426,22 @@ class OptimizedFFmpegWrapper(FFmpegWrapper):
                    - superfast, veryfast, faster, fast: 速度递减，质量递增
                    - medium: 平衡速度和质量（默认）
                    - slow, slower, veryslow: 速度递减，质量最高
+            tune: libx264 的 -tune 参数（film, animation, fastdecode 等），
+                  只用于 CPU 编码；GPU 编码器的 tune 取值不同，不会传入
+            threads: 每个编码器的线程数，0 表示由编码器自动决定；同时运行
+                     多个 FFmpeg 时应按 CPU 核数 / 并发数设置，避免过度订阅
+            spec_presets: 按分辨率名称覆盖编码预设，如 {"480p": "ultrafast"}；
+                          未列出的规格使用 preset
         """
         super().__init__()
         self.enable_gpu = enable_gpu
         self.preset = preset
+        self.tune = tune
+        self.threads = threads
+        self.spec_presets = dict(spec_presets) if spec_presets else {}
         self.gpu_info = self._detect_gpu_hardware()
         self.gpu_encoder = self._detect_gpu_encoder()
+        self.gpu_scaler = self._detect_gpu_scaler()
         self._print_gpu_status()
     
     def _detect_gpu_hardware(self) -> Dict[str, Any]:
@@ -469,6 +536,8 @@ class OptimizedFFmpegWrapper(FFmpegWrapper):
                 
                 if 'nvenc' in self.gpu_encoder:
                     print(f"  类型: NVIDIA NVENC 硬件编码")
+                    if self.gpu_scaler:
+                        print(f"  解码/缩放: NVDEC + {self.gpu_scaler}")
                 elif 'qsv' in self.gpu_encoder:
                     print(f"  类型: Intel Quick Sync Video")
                 elif 'videotoolbox' in self.gpu_encoder:
@@ -528,30 +597,52 @@ class OptimizedFFmpegWrapper(FFmpegWrapper):
         
         return None
     
-    def build_transcode_command(
-        self,
-        input_path: Path,
-        output_path: Path,
-        spec: TranscodeSpec
-    ) -> List[str]:
-        """构建优化的转码命令
+    def _detect_gpu_scaler(self) -> Optional[str]:
+        """检测可与 NVENC 配合的 CUDA 缩放滤镜
+        
+        scale_npp 需要 FFmpeg 编译时启用 libnpp，scale_cuda 在较新的
+        FFmpeg 中更常见；两者都没有时缩放仍在 CPU 上进行。
+        
+        Returns:
+            滤镜名称；未使用 NVENC 或滤镜不可用时返回 None
+        """
+        if not self.gpu_encoder or 'nvenc' not in self.gpu_encoder:
+            return None
+        
+        try:
+            result = subprocess.run(
+                ['ffmpeg', '-hide_banner', '-filters'],
+                capture_output=True,
+                text=True,
+                encoding='utf-8',
+                errors='replace'
+            )
+        except Exception:
+            return None
+        
+        for scaler in ('scale_npp', 'scale_cuda'):
+            if re.search(rf'\s{scaler}\s', result.stdout):
+                return scaler
+        return None
+    
+    def _video_encoder_options(self, spec: TranscodeSpec) -> List[str]:
+        """构建视频编码器及其质量参数
         
         根据是否有可用的 GPU 编码器，自动选择最优的编码方式。
         
         Args:
-            input_path: 输入视频文件路径
-            output_path: 输出视频文件路径
             spec: 转码规格
             
         Returns:
-            完整的 FFmpeg 命令行参数列表
+            视频编码相关的 FFmpeg 选项列表
         """
-        cmd = ['ffmpeg', '-i', str(input_path)]
+        options = []
+        preset = self.spec_presets.get(spec.resolution_name, self.preset)
         
         # 选择视频编码器
         if self.gpu_encoder:
             # 使用 GPU 编码器
-            cmd.extend(['-c:v', self.gpu_encoder])
+            options.extend(['-c:v', self.gpu_encoder])
             
             # GPU 编码器特定参数
             if 'nvenc' in self.gpu_encoder:
@@ -567,49 +658,297 @@ class OptimizedFFmpegWrapper(FFmpegWrapper):
                     'slower': 'p6',
                     'veryslow': 'p7'
                 }
-                nvenc_preset = preset_map.get(self.preset, 'p4')
-                cmd.extend(['-preset', nvenc_preset])
+                nvenc_preset = preset_map.get(preset, 'p4')
+                options.extend(['-preset', nvenc_preset])
                 # NVENC 质量控制
-                cmd.extend(['-cq', '23'])  # 恒定质量模式，23是较好的质量
+                options.extend(['-cq', '23'])  # 恒定质量模式，23是较好的质量
             elif 'qsv' in self.gpu_encoder:
                 # Intel Quick Sync 预设
-                cmd.extend(['-preset', self.preset])
-                cmd.extend(['-global_quality', '23'])
+                options.extend(['-preset', preset])
+                options.extend(['-global_quality', '23'])
             elif 'videotoolbox' in self.gpu_encoder:
                 # macOS VideoToolbox
-                cmd.extend(['-b:v', '0'])  # 使用质量模式
-                cmd.extend(['-q:v', '65'])  # 质量参数 (0-100, 100最好)
+                options.extend(['-b:v', '0'])  # 使用质量模式
+                options.extend(['-q:v', '65'])  # 质量参数 (0-100, 100最好)
         else:
             # 使用 CPU 编码器 (libx264)
-            cmd.extend(['-c:v', spec.video_codec])
-            cmd.extend(['-preset', self.preset])
+            options.extend(['-c:v', spec.video_codec])
+            options.extend(['-preset', preset])
+            if self.tune:
+                options.extend(['-tune', self.tune])
             # CRF 质量控制：18-28 是合理范围，23 是默认值
             # 数值越小质量越好但文件越大
-            cmd.extend(['-crf', '23'])
+            options.extend(['-crf', '23'])
+            if spec.video_codec == 'libx264':
+                options.extend(['-x264-params', self._x264_thread_params(spec)])
+        
+        if self.threads:
+            options.extend(['-threads', str(self.threads)])
+        
+        return options
+    
+    @staticmethod
+    def _x264_thread_params(spec: TranscodeSpec) -> str:
+        """按输出分辨率选择 x264 的线程划分方式
+        
+        帧级多线程在小分辨率（≤480p）上并行度不足，改用分片多线程
+        （sliced-threads）让一帧内的编码也能分到多个核上，代价是压缩率
+        略有下降；更高分辨率保持帧级多线程。总线程数仍由 -threads
+        （或 x264 自动）决定。
         
-        # 视频缩放（保持宽高比，不添加黑边）
-        # force_original_aspect_ratio=decrease: 确保视频不会被拉伸
-        # 只缩放，不填充黑边
-        scale_filter = (
-            f'scale={spec.width}:{spec.height}:'
+        Args:
+            spec: 转码规格
+            
+        Returns:
+            -x264-params 的参数值
+        """
+        if spec.height <= 480:
+            return 'sliced-threads=1:lookahead-threads=2'
+        return 'sliced-threads=0:lookahead-threads=2'
+    
+    @staticmethod
+    def _scale_filter(spec: TranscodeSpec, scaler: str = 'scale') -> str:
+        """构建缩放滤镜
+        
+        保持宽高比，不添加黑边：force_original_aspect_ratio=decrease
+        确保视频不会被拉伸，只缩放，不填充黑边。
+        
+        Args:
+            spec: 转码规格
+            scaler: 缩放滤镜名称；CUDA 滤镜（scale_npp/scale_cuda）在显存中
+                缩放，同时转换为 yuv420p 以代替输出端的 -pix_fmt
+            
+        Returns:
+            缩放滤镜字符串
+        """
+        scale = (
+            f'{scaler}={spec.width}:{spec.height}:'
             f'force_original_aspect_ratio=decrease'
         )
-        cmd.extend(['-vf', scale_filter])
+        if scaler != 'scale':
+            scale += ':format=yuv420p'
+        return scale
+    
+    @classmethod
+    def _build_cascade_filter(cls, specs: List[TranscodeSpec], scaler: str = 'scale') -> str:
+        """构建逐级缩放的 filter_complex 滤镜图
         
-        # 音频编码器和比特率
-        cmd.extend(['-c:a', spec.audio_codec])
-        cmd.extend(['-b:a', '128k'])  # 音频比特率 128kbps
+        按高度从大到小逐级缩放：最大的规格从源视频缩放，之后每个规格
+        从上一级的缩放结果再缩放（1080→720→480），小分辨率的缩放器
+        读取的像素远少于源视频。第 i 个规格的输出标签为 [v{i}]。
         
-        # 像素格式（确保兼容性）
-        cmd.extend(['-pix_fmt', 'yuv420p'])
+        如果某个规格的宽或高超过上一级（不能嵌套在上一级的画面里），
+        则所有规格都直接从源视频缩放。
         
+        Args:
+            specs: 转码规格列表，不能为空
+            scaler: 缩放滤镜名称，见 _scale_filter
+            
+        Returns:
+            滤镜图字符串
+        """
+        count = len(specs)
+        if count == 1:
+            return f'[0:v]{cls._scale_filter(specs[0], scaler)}[v0]'
+        
+        order = sorted(range(count), key=lambda i: specs[i].height, reverse=True)
+        nested = all(
+            specs[cur].width <= specs[prev].width and specs[cur].height <= specs[prev].height
+            for prev, cur in zip(order, order[1:])
+        )
+        
+        if not nested:
+            return (
+                f'[0:v]split={count}' + ''.join(f'[s{i}]' for i in range(count)) + ';'
+                + ';'.join(
+                    f'[s{i}]{cls._scale_filter(spec, scaler)}[v{i}]'
+                    for i, spec in enumerate(specs)
+                )
+            )
+        
+        parts = []
+        source = '[0:v]'
+        for level, i in enumerate(order):
+            scale = cls._scale_filter(specs[i], scaler)
+            if level == count - 1:
+                parts.append(f'{source}{scale}[v{i}]')
+            else:
+                # 一路作为该规格的输出，另一路供下一级继续缩放
+                parts.append(f'{source}{scale},split=2[v{i}][c{level}]')
+                source = f'[c{level}]'
+        return ';'.join(parts)
+    
+    @staticmethod
+    def _output_format_options(spec: TranscodeSpec, pix_fmt: bool = True) -> List[str]:
+        """构建音频编码和输出容器相关的选项
+        
+        Args:
+            spec: 转码规格
+            pix_fmt: 是否指定 -pix_fmt yuv420p；帧在显存中时由缩放滤镜
+                负责格式转换，此时不能再指定
+            
+        Returns:
+            FFmpeg 选项列表
+        """
+        # 音频编码器和比特率（128kbps）
+        options = ['-c:a', spec.audio_codec, '-b:a', '128k']
+        if pix_fmt:
+            # 像素格式（确保兼容性）
+            options.extend(['-pix_fmt', 'yuv420p'])
         # 移动 moov atom 到文件开头（优化流媒体播放）
-        cmd.extend(['-movflags', '+faststart'])
+        options.extend(['-movflags', '+faststart'])
+        return options
+    
+    def build_transcode_ffmpeg_command(
+        self,
+        input_path: Path,
+        output_path: Path,
+        spec: TranscodeSpec
+    ) -> FFmpegCommand:
+        """构建优化的转码命令
+        
+        根据是否有可用的 GPU 编码器，自动选择最优的编码方式。
+        
+        Args:
+            input_path: 输入视频文件路径
+            output_path: 输出视频文件路径
+            spec: 转码规格
+            
+        Returns:
+            FFmpeg 命令对象，可直接交给 execute 执行
+        """
+        return FFmpegCommand(
+            inputs=[input_path],
+            output=output_path,
+            options=PROGRESS_OPTIONS + self._transcode_options(spec)
+        )
+    
+    def _transcode_options(self, spec: TranscodeSpec) -> List[str]:
+        """单个规格转码的编码、缩放和输出选项"""
+        options = self._video_encoder_options(spec)
+        options.extend(['-vf', self._scale_filter(spec)])
+        options.extend(self._output_format_options(spec))
         
         # 覆盖输出文件
-        cmd.extend(['-y'])
+        options.append('-y')
+        return options
+    
+    def build_transcode_command(
+        self,
+        input_path: Path,
+        output_path: Path,
+        spec: TranscodeSpec
+    ) -> List[str]:
+        """构建优化的转码命令行（兼容旧接口）
         
-        return cmd
+        新代码应使用 build_transcode_ffmpeg_command。
+        
+        Args:
+            input_path: 输入视频文件路径
+            output_path: 输出视频文件路径
+            spec: 转码规格
+            
+        Returns:
+            FFmpeg 命令行参数列表（不含末尾的输出文件路径）
+        """
+        return ['ffmpeg', '-i', str(input_path)] + self._transcode_options(spec)
+    
+    def build_remux_command(self, input_path: Path, output_path: Path) -> FFmpegCommand:
+        """构建不重新编码的重新封装命令
+        
+        直接复制音视频流，并把 moov atom 移到文件开头。
+        
+        Args:
+            input_path: 输入视频文件路径
+            output_path: 输出视频文件路径
+            
+        Returns:
+            FFmpeg 命令对象
+        """
+        return FFmpegCommand(
+            inputs=[input_path],
+            output=output_path,
+            options=['-c', 'copy', '-movflags', '+faststart', '-y']
+        )
+    
+    def build_multi_transcode_command(
+        self,
+        input_path: Path,
+        targets: List[Tuple[TranscodeSpec, Path]],
+        hw_decode: bool = True
+    ) -> FFmpegCommand:
+        """构建一次解码、同时输出多个分辨率的转码命令
+        
+        输入视频只解码一次，在 filter_complex 中逐级缩放出各个分辨率
+        （见 _build_cascade_filter），每路分别编码写入对应的输出文件。
+        相比每个规格单独运行一次 FFmpeg，省去了重复的解码和磁盘读取。
+        
+        使用 NVENC 且有 CUDA 缩放滤镜时改用 _build_nvenc_command，
+        解码、缩放、编码都在 GPU 上完成。
+        
+        Args:
+            input_path: 输入视频文件路径
+            targets: (转码规格, 输出文件路径) 列表，不能为空
+            hw_decode: 是否允许使用 GPU 解码和缩放
+            
+        Returns:
+            FFmpeg 命令对象
+        """
+        if hw_decode and self.gpu_scaler:
+            return self._build_nvenc_command(input_path, targets)
+        
+        graph = self._build_cascade_filter([spec for spec, _ in targets])
+        
+        outputs = []
+        for i, (spec, output_path) in enumerate(targets):
+            output_options = ['-map', f'[v{i}]', '-map', '0:a:0?']
+            output_options.extend(self._video_encoder_options(spec))
+            output_options.extend(self._output_format_options(spec))
+            outputs.append((output_options, output_path))
+        
+        first_options, first_output = outputs[0]
+        return FFmpegCommand(
+            inputs=[input_path],
+            output=first_output,
+            options=PROGRESS_OPTIONS + ['-filter_complex', graph, '-y'] + first_options,
+            extra_outputs=outputs[1:]
+        )
+    
+    def _build_nvenc_command(
+        self,
+        input_path: Path,
+        targets: List[Tuple[TranscodeSpec, Path]]
+    ) -> FFmpegCommand:
+        """构建全程在 GPU 上完成的多分辨率转码命令
+        
+        NVDEC 解码后帧留在显存中（-hwaccel_output_format cuda），由 CUDA
+        缩放滤镜逐级缩放，再交给各路 h264_nvenc 编码，中间不经过
+        PCIe 往返拷贝。
+        
+        Args:
+            input_path: 输入视频文件路径
+            targets: (转码规格, 输出文件路径) 列表，不能为空
+            
+        Returns:
+            FFmpeg 命令对象
+        """
+        graph = self._build_cascade_filter([spec for spec, _ in targets], self.gpu_scaler)
+        
+        outputs = []
+        for i, (spec, output_path) in enumerate(targets):
+            output_options = ['-map', f'[v{i}]', '-map', '0:a:0?']
+            output_options.extend(self._video_encoder_options(spec))
+            output_options.extend(self._output_format_options(spec, pix_fmt=False))
+            outputs.append((output_options, output_path))
+        
+        first_options, first_output = outputs[0]
+        return FFmpegCommand(
+            inputs=[input_path],
+            output=first_output,
+            options=PROGRESS_OPTIONS + ['-filter_complex', graph, '-y'] + first_options,
+            extra_outputs=outputs[1:],
+            input_options=['-hwaccel', 'cuda', '-hwaccel_output_format', 'cuda']
+        )
     
     def build_merge_command(
         self,
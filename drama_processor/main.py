@@ -23,7 +23,7 @@ from .progress import ProgressTracker
 from .error_handler import ErrorHandler
 
 
-def create_orchestrator(config: ProcessingConfig, enable_gpu: bool = False, preset: str = "medium") -> Orchestrator:
+def create_orchestrator(config: ProcessingConfig, enable_gpu: bool = False, preset: str = "faster") -> Orchestrator:
     """根据配置创建合适的编排器
     
     根据配置选项创建不同功能组合的编排器：
@@ -92,11 +92,13 @@ def create_orchestrator(config: ProcessingConfig, enable_gpu: bool = False, pres
                 self.logger = logger
                 self.error_handler = error_handler
                 self.state_manager = StateManager(state_file)
+                self._op_table = self._build_op_table()
                 
                 # 如果是并发编排器，保留并发功能
                 if isinstance(base_orchestrator, ConcurrentOrchestrator):
                     self.max_workers = base_orchestrator.max_workers
                     self._lock = None
+                    self._executor = None
             
             def _get_lock(self):
                 """获取线程锁(延迟初始化)"""
@@ -105,6 +107,10 @@ def create_orchestrator(config: ProcessingConfig, enable_gpu: bool = False, pres
                     self._lock = threading.Lock()
                 return self._lock
             
+            # 复用并发编排器的线程池管理
+            _get_executor = ConcurrentOrchestrator._get_executor
+            close = ConcurrentOrchestrator.close
+            
             def process_batch(self, drama_dirs, operation="merge", progress_callback=None, skip_completed=True):
                 """批量处理（支持并发和断点续传）"""
                 # 过滤已完成的任务
@@ -149,6 +155,9 @@ def create_orchestrator(config: ProcessingConfig, enable_gpu: bool = False, pres
                             result.error_message or "未知错误"
                         )
                 
+                # 本批结果统一写入一次状态文件
+                self.state_manager.flush()
+                
                 return results
         
         orchestrator = ConcurrentResumableOrchestrator(
@@ -370,7 +379,7 @@ def run_separate(config: ProcessingConfig) -> bool:
         return False
 
 
-def run_transcode(config: ProcessingConfig, enable_gpu: bool = False, preset: str = "medium") -> bool:
+def run_transcode(config: ProcessingConfig, enable_gpu: bool = False, preset: str = "faster") -> bool:
     """执行视频转码
     
     Args:
@@ -20,7 +20,7 @@ from .models import (
     ProgressInfo,
 )
 from .sorter import FileSorter
-from .ffmpeg_wrapper import FFmpegWrapper, OptimizedFFmpegWrapper
+from .ffmpeg_wrapper import FFmpegWrapper, FFmpegCommand, OptimizedFFmpegWrapper
 from .subtitle import SubtitleFile
 from .logger import ProcessingLogger
 from .file_manager import FileManager
@@ -216,8 +216,6 @@ class VideoMerger(VideoProcessor):
                     concat_file.unlink()
         else:
             # 使用标准的 FFmpeg 包装器
-            from .ffmpeg_wrapper import FFmpegCommand
-            
             # 构建 concat filter 命令
             segment_paths = [seg.path for seg in segments]
             
@@ -288,13 +286,14 @@ class VideoMerger(VideoProcessor):
         cumulative_offset = 0.0
         global_index = 1
         
-        # 获取第一个字幕文件的解析器（用于保存）
+        # 第一个字幕文件的解析器和头部用于保存
         first_subtitle = SubtitleFile.parse(segments[0].path)
         parser = first_subtitle.parser
+        header = first_subtitle.header
         
         for i, subtitle_seg in enumerate(segments):
-            # 解析字幕文件
-            subtitle_file = SubtitleFile.parse(subtitle_seg.path)
+            # 解析字幕文件（第一个已经解析过）
+            subtitle_file = first_subtitle if i == 0 else SubtitleFile.parse(subtitle_seg.path)
             
             # 偏移时间戳
             if cumulative_offset > 0:
@@ -314,7 +313,8 @@ class VideoMerger(VideoProcessor):
         merged_subtitle = SubtitleFile(
             entries=all_entries,
             format=first_format,
-            parser=parser
+            parser=parser,
+            header=header
         )
         
         # 保存合并后的字幕文件
@@ -8,12 +8,17 @@
 - 配置类
 """
 
+import sys
 from enum import Enum
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Optional, List
 
 
+# dataclass(slots=True) 需要 Python 3.10+；旧版本退化为普通 dataclass
+DATACLASS_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+
 class ProcessingStatus(Enum):
     """处理状态枚举
     
@@ -155,11 +160,15 @@ class SubtitleEntry:
         )
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class DramaDirectory:
     """短剧目录
     
-    表示一个短剧目录的结构信息。
+    表示一个短剧目录的结构信息。扫描大量目录时会创建很多实例，
+    因此在支持的 Python 版本上使用 __slots__ 以去掉每个实例的 __dict__。
+    
+    子目录标志为 None 表示尚未检测；DirectoryScanner 在扫描时只记录路径，
+    在 validate_for_* 首次需要时才检测子目录结构。
     
     Attributes:
         path: 目录路径
@@ -171,10 +180,10 @@ class DramaDirectory:
     """
     path: Path
     name: str
-    has_video_dir: bool
-    has_srt_dir: bool
-    has_merged_dir: bool
-    has_cleared_dir: bool
+    has_video_dir: Optional[bool] = None
+    has_srt_dir: Optional[bool] = None
+    has_merged_dir: Optional[bool] = None
+    has_cleared_dir: Optional[bool] = None
 
 
 @dataclass
@@ -6,7 +6,7 @@
 
 import time
 from pathlib import Path
-from typing import List, Optional, Dict
+from typing import Callable, Dict, List, Optional, Tuple
 
 from .interfaces import ProgressCallback
 from .models import ProcessingResult, ProcessingStatus, ProgressInfo
@@ -32,7 +32,7 @@ class Orchestrator:
         accompaniment_volume: float = 0.0,
         transcode_specs: Optional[List] = None,
         enable_gpu: bool = False,
-        preset: str = "medium"
+        preset: str = "faster"
     ):
         """初始化编排器
         
@@ -59,23 +59,42 @@ class Orchestrator:
         self.scanner = DirectoryScanner()
         self.logger = logger or ProcessingLogger()
         self.error_handler = error_handler or ErrorHandler()
+        self._op_table = self._build_op_table()
     
-    def merge(
-        self, 
+    def _build_op_table(self) -> Dict[str, Tuple[Callable, Callable, str]]:
+        """构建操作分发表
+        
+        Returns:
+            操作名到 (验证函数, 处理函数, 操作描述) 的映射
+        """
+        return {
+            "merge": (self.scanner.validate_for_merge, self.merger.process, "合并"),
+            "separate": (self.scanner.validate_for_separation, self.separator.process, "音频分离"),
+            "transcode": (self.scanner.validate_for_transcode, self.transcoder.process, "转码"),
+        }
+    
+    def _run(
+        self,
+        op: str,
         drama_dir: Path,
         progress_callback: Optional[ProgressCallback] = None
     ) -> ProcessingResult:
-        """执行视频合并
+        """执行单个目录的指定操作
+        
+        merge/separate/transcode 共用的验证、执行和错误处理流程。
         
         Args:
+            op: 操作类型 ("merge", "separate", "transcode")
             drama_dir: 短剧目录路径
             progress_callback: 可选的进度回调对象
             
         Returns:
             处理结果
         """
-        start_time = time.time()
-        self.logger.log_task_start("merge", drama_dir)
+        validator, processor, label = self._op_table[op]
+        
+        start_time = time.monotonic()
+        self.logger.log_task_start(op, drama_dir)
         
         try:
             # 验证目录结构
@@ -86,33 +105,33 @@ class Orchestrator:
                 raise ValidationError(f"目录不符合 drama-XXXX 命名模式: {drama_dir}")
             
             drama = matching_dirs[0]
-            if not self.scanner.validate_for_merge(drama):
-                raise ValidationError(f"目录结构不适合合并操作: {drama_dir}")
+            if not validator(drama):
+                raise ValidationError(f"目录结构不适合{label}操作: {drama_dir}")
             
-            # 执行合并
-            result = self.merger.process(drama_dir, progress_callback)
+            # 执行操作
+            result = processor(drama_dir, progress_callback)
             
-            duration = time.time() - start_time
-            self.logger.log_task_complete("merge", drama_dir, duration)
+            duration = time.monotonic() - start_time
+            self.logger.log_task_complete(op, drama_dir, duration)
             
             return result
             
         except Exception as e:
-            self.logger.log_task_error("merge", drama_dir, e)
+            self.logger.log_task_error(op, drama_dir, e)
             return ProcessingResult(
                 status=ProcessingStatus.FAILED,
                 input_path=drama_dir,
                 output_path=None,
                 error_message=str(e),
-                duration_seconds=time.time() - start_time
+                duration_seconds=time.monotonic() - start_time
             )
     
-    def separate(
+    def merge(
         self, 
         drama_dir: Path,
         progress_callback: Optional[ProgressCallback] = None
     ) -> ProcessingResult:
-        """执行音频分离
+        """执行视频合并
         
         Args:
             drama_dir: 短剧目录路径
@@ -121,38 +140,23 @@ class Orchestrator:
         Returns:
             处理结果
         """
-        start_time = time.time()
-        self.logger.log_task_start("separate", drama_dir)
+        return self._run("merge", drama_dir, progress_callback)
+    
+    def separate(
+        self, 
+        drama_dir: Path,
+        progress_callback: Optional[ProgressCallback] = None
+    ) -> ProcessingResult:
+        """执行音频分离
         
-        try:
-            # 验证目录结构
-            drama_info = self.scanner.scan_drama_root(drama_dir.parent)
-            matching_dirs = [d for d in drama_info if d.path == drama_dir]
-            
-            if not matching_dirs:
-                raise ValidationError(f"目录不符合 drama-XXXX 命名模式: {drama_dir}")
-            
-            drama = matching_dirs[0]
-            if not self.scanner.validate_for_separation(drama):
-                raise ValidationError(f"目录结构不适合音频分离操作: {drama_dir}")
-            
-            # 执行音频分离
-            result = self.separator.process(drama_dir, progress_callback)
-            
-            duration = time.time() - start_time
-            self.logger.log_task_complete("separate", drama_dir, duration)
-            
-            return result
+        Args:
+            drama_dir: 短剧目录路径
+            progress_callback: 可选的进度回调对象
             
-        except Exception as e:
-            self.logger.log_task_error("separate", drama_dir, e)
-            return ProcessingResult(
-                status=ProcessingStatus.FAILED,
-                input_path=drama_dir,
-                output_path=None,
-                error_message=str(e),
-                duration_seconds=time.time() - start_time
-            )
+        Returns:
+            处理结果
+        """
+        return self._run("separate", drama_dir, progress_callback)
     
     def transcode(
         self, 
@@ -168,38 +172,7 @@ class Orchestrator:
         Returns:
             处理结果
         """
-        start_time = time.time()
-        self.logger.log_task_start("transcode", drama_dir)
-        
-        try:
-            # 验证目录结构
-            drama_info = self.scanner.scan_drama_root(drama_dir.parent)
-            matching_dirs = [d for d in drama_info if d.path == drama_dir]
-            
-            if not matching_dirs:
-                raise ValidationError(f"目录不符合 drama-XXXX 命名模式: {drama_dir}")
-            
-            drama = matching_dirs[0]
-            if not self.scanner.validate_for_transcode(drama):
-                raise ValidationError(f"目录结构不适合转码操作: {drama_dir}")
-            
-            # 执行转码
-            result = self.transcoder.process(drama_dir, progress_callback)
-            
-            duration = time.time() - start_time
-            self.logger.log_task_complete("transcode", drama_dir, duration)
-            
-            return result
-            
-        except Exception as e:
-            self.logger.log_task_error("transcode", drama_dir, e)
-            return ProcessingResult(
-                status=ProcessingStatus.FAILED,
-                input_path=drama_dir,
-                output_path=None,
-                error_message=str(e),
-                duration_seconds=time.time() - start_time
-            )
+        return self._run("transcode", drama_dir, progress_callback)
     
     def process_batch(
         self,
@@ -221,16 +194,10 @@ class Orchestrator:
         total = len(drama_dirs)
         
         # 选择操作方法
-        operation_map = {
-            "merge": self.merge,
-            "separate": self.separate,
-            "transcode": self.transcode
-        }
-        
-        if operation not in operation_map:
+        if operation not in self._op_table:
             raise ValueError(f"不支持的操作类型: {operation}")
         
-        operation_func = operation_map[operation]
+        operation_func = lambda d, cb, op=operation: self._run(op, d, cb)
         
         # 处理每个目录
         for i, drama_dir in enumerate(drama_dirs):
@@ -287,7 +254,7 @@ class ConcurrentOrchestrator(Orchestrator):
         accompaniment_volume: float = 0.0,
         transcode_specs: Optional[List] = None,
         enable_gpu: bool = False,
-        preset: str = "medium"
+        preset: str = "faster"
     ):
         """初始化并发编排器
         
@@ -304,6 +271,7 @@ class ConcurrentOrchestrator(Orchestrator):
         super().__init__(logger, error_handler, audio_separator_model, accompaniment_volume, transcode_specs, enable_gpu, preset)
         self.max_workers = max_workers
         self._lock = None  # 延迟初始化,避免序列化问题
+        self._executor = None  # 延迟初始化,跨批次复用
     
     def _get_lock(self):
         """获取线程锁(延迟初始化)"""
@@ -312,6 +280,29 @@ class ConcurrentOrchestrator(Orchestrator):
             self._lock = threading.Lock()
         return self._lock
     
+    def _get_executor(self):
+        """获取线程池(延迟初始化)
+        
+        线程池在多次 process_batch 调用之间复用，避免每批次重新创建工作线程。
+        首次创建时注册 atexit 钩子，确保进程退出前关闭线程池。
+        """
+        if getattr(self, '_executor', None) is None:
+            import atexit
+            from concurrent.futures import ThreadPoolExecutor
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix="drama"
+            )
+            atexit.register(self.close)
+        return self._executor
+    
+    def close(self) -> None:
+        """关闭线程池并等待所有任务完成"""
+        executor = getattr(self, '_executor', None)
+        if executor is not None:
+            self._executor = None
+            executor.shutdown(wait=True)
+    
     def process_batch(
         self,
         drama_dirs: List[Path],
@@ -328,26 +319,23 @@ class ConcurrentOrchestrator(Orchestrator):
         Returns:
             处理结果列表
         """
-        from concurrent.futures import ThreadPoolExecutor, as_completed
+        from concurrent.futures import as_completed
         
         results = [None] * len(drama_dirs)  # 预分配结果列表
         total = len(drama_dirs)
         completed_count = [0]  # 使用列表以便在闭包中修改
+        start_times = [None] * len(drama_dirs)  # 各任务开始时间（单调时钟）
         
         # 选择操作方法
-        operation_map = {
-            "merge": self.merge,
-            "separate": self.separate,
-            "transcode": self.transcode
-        }
-        
-        if operation not in operation_map:
+        if operation not in self._op_table:
             raise ValueError(f"不支持的操作类型: {operation}")
         
-        operation_func = operation_map[operation]
+        operation_func = lambda d, cb, op=operation: self._run(op, d, cb)
         
         def process_single(index: int, drama_dir: Path) -> tuple[int, ProcessingResult]:
             """处理单个目录并返回索引和结果"""
+            start_times[index] = time.monotonic()
+            
             # 通知开始
             if progress_callback:
                 with self._get_lock():
@@ -371,31 +359,33 @@ class ConcurrentOrchestrator(Orchestrator):
             
             return index, result
         
-        # 使用线程池并发处理
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            # 提交所有任务
-            futures = {
-                executor.submit(process_single, i, drama_dir): i
-                for i, drama_dir in enumerate(drama_dirs)
-            }
-            
-            # 收集结果
-            for future in as_completed(futures):
-                try:
-                    index, result = future.result()
-                    results[index] = result
-                except Exception as e:
-                    # 处理未预期的异常
-                    index = futures[future]
-                    drama_dir = drama_dirs[index]
-                    self.logger.log_task_error(operation, drama_dir, e)
-                    results[index] = ProcessingResult(
-                        status=ProcessingStatus.FAILED,
-                        input_path=drama_dir,
-                        output_path=None,
-                        error_message=str(e),
-                        duration_seconds=0.0
-                    )
+        # 使用线程池并发处理（线程池跨批次复用）
+        executor = self._get_executor()
+        
+        # 提交所有任务
+        futures = {
+            executor.submit(process_single, i, drama_dir): i
+            for i, drama_dir in enumerate(drama_dirs)
+        }
+        
+        # 收集结果
+        for future in as_completed(futures):
+            try:
+                index, result = future.result()
+                results[index] = result
+            except Exception as e:
+                # 处理未预期的异常
+                index = futures[future]
+                drama_dir = drama_dirs[index]
+                self.logger.log_task_error(operation, drama_dir, e)
+                started = start_times[index]
+                results[index] = ProcessingResult(
+                    status=ProcessingStatus.FAILED,
+                    input_path=drama_dir,
+                    output_path=None,
+                    error_message=str(e),
+                    duration_seconds=time.monotonic() - started if started is not None else 0.0
+                )
         
         # 记录批量处理摘要
         success_count = sum(1 for r in results if r and r.status == ProcessingStatus.COMPLETED)
@@ -486,6 +476,9 @@ class ResumableOrchestrator(Orchestrator):
                     result.error_message or "未知错误"
                 )
         
+        # 本批结果统一写入一次状态文件
+        self.state_manager.flush()
+        
         return results
     
     def get_summary(self) -> Dict:
@@ -4,6 +4,7 @@
 跟踪和显示处理进度。
 """
 
+import threading
 from typing import Optional
 
 from .interfaces import ProgressCallback
@@ -79,3 +80,25 @@ class ProgressTracker(ProgressCallback):
         self.total = 0
         self.current_file = ""
 
+
+class LockedProgressCallback(ProgressCallback):
+    """串行化回调调用的进度回调包装
+    
+    并发处理多个目录时，保证原回调不会被多个线程同时调用。
+    """
+    
+    def __init__(self, callback: ProgressCallback):
+        self._callback = callback
+        self._lock = threading.Lock()
+    
+    def on_progress(self, info: ProgressInfo) -> None:
+        with self._lock:
+            self._callback.on_progress(info)
+    
+    def on_file_start(self, filename: str) -> None:
+        with self._lock:
+            self._callback.on_file_start(filename)
+    
+    def on_file_complete(self, result: ProcessingResult) -> None:
+        with self._lock:
+            self._callback.on_file_complete(result)
@@ -47,8 +47,12 @@ class DetailedProcessingReport:
         return len(self.successful_tasks) / self.total_tasks * 100
     
     def to_dict(self) -> dict:
-        """转换为字典"""
-        return {
+        """转换为字典
+        
+        success_rate 以数值（百分比，保留两位小数）输出；
+        任务明细列表仅在非空时包含。
+        """
+        data = {
             'operation': self.operation,
             'start_time': self.start_time.isoformat(),
             'end_time': self.end_time.isoformat() if self.end_time else None,
@@ -57,17 +61,21 @@ class DetailedProcessingReport:
             'successful_count': len(self.successful_tasks),
             'failed_count': len(self.failed_tasks),
             'skipped_count': len(self.skipped_tasks),
-            'success_rate': f"{self.success_rate:.2f}%",
-            'successful_tasks': self.successful_tasks,
-            'failed_tasks': [
+            'success_rate': round(self.success_rate, 2),
+        }
+        if self.successful_tasks:
+            data['successful_tasks'] = self.successful_tasks
+        if self.failed_tasks:
+            data['failed_tasks'] = [
                 {'path': path, 'error': error}
                 for path, error in self.failed_tasks
-            ],
-            'skipped_tasks': [
+            ]
+        if self.skipped_tasks:
+            data['skipped_tasks'] = [
                 {'path': path, 'reason': reason}
                 for path, reason in self.skipped_tasks
             ]
-        }
+        return data
     
     def save_to_file(self, output_path: Path) -> None:
         """保存报告到文件
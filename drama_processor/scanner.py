@@ -10,9 +10,13 @@
 验证需求：5.1, 5.2, 5.3, 5.4
 """
 
+import os
 import re
+import stat
+from concurrent.futures import ThreadPoolExecutor
+from operator import attrgetter
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, FrozenSet, Iterator, List, Literal, Optional, Sequence, Set, Tuple, Union
 
 from .models import DramaDirectory
 
@@ -21,6 +25,56 @@ from .models import DramaDirectory
 # 支持格式：drama-0001, drama-1234, drama-9999 等
 DRAMA_DIR_PATTERN = re.compile(r'^drama-\d{4}$')
 
+# 短剧目录下需要检测的子目录名
+_REQUIRED_SUBDIRS = frozenset({'video', 'srt', 'merged', 'cleared'})
+
+# 短剧目录顶层需要检测的名称（额外包含新格式的 original/）
+_TOP_LEVEL_SUBDIRS = _REQUIRED_SUBDIRS | {'original'}
+
+# 短剧目录的布局：
+# - auto: 每个目录分别检测（original/ 存在时两种格式都检查）
+# - original: 所有目录都是新格式，只检查 original/ 下的子目录
+# - flat: 所有目录都是旧格式，只检查直接子目录
+ScanLayout = Literal['auto', 'original', 'flat']
+_LAYOUTS = ('auto', 'original', 'flat')
+
+# 少于该数量的目录直接串行检测，避免线程池的调度开销
+_PARALLEL_PROBE_MIN = 8
+
+# 按名称排序的键函数（C 实现，比 lambda 调用开销更低）
+_BY_NAME = attrgetter('name')
+
+# _is_drama_name_fast 使用的常量：4 个字节分别为 '0'、'9' 及各字节最高位
+_PREFIX = 'drama-'
+_DIGITS_ZERO = 0x30303030
+_DIGITS_NINE = 0x39393939
+_HIGH_BITS = 0x80808080
+
+
+def _is_drama_name_fast(name: str) -> bool:
+    """不经过正则引擎判断名称是否符合 drama-XXXX 模式
+    
+    长度固定为 10、前缀为 "drama-" 时，把后 4 个字符按 ASCII 编码成
+    一个 32 位整数，用 SWAR 方式一次判断 4 个字节是否都在 '0'..'9' 之间：
+    任一字节越界时，对应字节的最高位会在两次减法之一中被置位。
+    
+    与 DRAMA_DIR_PATTERN 相比只接受 ASCII 数字（正则的 \\d 还接受
+    其他 Unicode 十进制数字），实际的目录名不受影响。
+    
+    Args:
+        name: 目录名称
+        
+    Returns:
+        是否符合命名模式
+    """
+    if len(name) != 10 or not name.startswith(_PREFIX):
+        return False
+    digits = name[6:].encode('ascii', 'ignore')
+    if len(digits) != 4:
+        return False
+    v = int.from_bytes(digits, 'little')
+    return ((v - _DIGITS_ZERO) | (_DIGITS_NINE - v)) & _HIGH_BITS == 0
+
 
 class DirectoryScanner:
     """目录扫描器
@@ -43,108 +97,337 @@ class DirectoryScanner:
         pattern: 目录命名模式的正则表达式
     """
     
-    def __init__(self, pattern: Optional[re.Pattern] = None):
+    def __init__(
+        self,
+        pattern: Optional[re.Pattern] = None,
+        max_workers: Optional[int] = None,
+        layout: ScanLayout = 'auto'
+    ):
         """初始化目录扫描器
         
         Args:
             pattern: 自定义的目录命名模式正则表达式，
                     默认为 drama-XXXX 格式
+            max_workers: 批量检测子目录结构时的最大线程数，
+                    默认为 min(32, CPU 核数 * 4)；网络文件系统上可适当调大，
+                    设为 1 则禁用并行检测
+            layout: 短剧目录布局，'auto' 逐个目录检测；已知所有目录
+                    统一为新格式（'original'）或旧格式（'flat'）时，
+                    每个子目录只需检查一个位置
+                    
+        Raises:
+            ValueError: 如果 layout 不是支持的取值
         """
+        if layout not in _LAYOUTS:
+            raise ValueError(f"不支持的目录布局: {layout}")
+        
         self.pattern = pattern or DRAMA_DIR_PATTERN
+        self.layout = layout
+        self.max_workers = max_workers or min(32, (os.cpu_count() or 1) * 4)
+        # 预先绑定匹配函数，扫描循环中省去每次的属性查找；
+        # 默认模式使用纯字符串判断，避免每个条目进入正则引擎并分配 Match 对象
+        if self.pattern is DRAMA_DIR_PATTERN:
+            self._match = _is_drama_name_fast
+        else:
+            self._match = self.pattern.match
+        # 根目录路径 -> (根目录 st_mtime_ns, 候选短剧目录路径列表)
+        # 只缓存候选目录列表：在短剧目录内创建 merged/ 等子目录不会改变
+        # 根目录的 mtime，因此子目录结构每次扫描都重新检查
+        self._scan_cache: Dict[str, Tuple[int, List[Path]]] = {}
+    
+    def clear_cache(self) -> None:
+        """清空扫描缓存"""
+        self._scan_cache.clear()
     
-    def _is_valid_drama_dir_name(self, name: str) -> bool:
+    def _is_valid_drama_dir_name(
+        self,
+        name: str
+    ) -> Union[bool, Optional["re.Match[str]"]]:
         """检查目录名是否符合 drama-XXXX 命名模式
         
+        scan_drama_root 的扫描循环直接使用预绑定的 self._match，
+        此方法保留供单个名称的判断使用。
+        
         Args:
             name: 目录名称
             
         Returns:
-            是否符合命名模式
+            真值表示符合命名模式：默认模式下为 bool，
+            自定义模式下为 Match 对象或 None（调用方只用于条件判断）
         """
-        return bool(self.pattern.match(name))
+        return self._match(name)
     
-    def _check_subdirectory(self, drama_path: Path, subdir_name: str) -> bool:
+    def _check_subdirectory(
+        self,
+        drama_path: Path,
+        subdir_name: str,
+        has_original: Optional[bool] = None
+    ) -> bool:
         """检查子目录是否存在
         
         支持两种目录结构：
         1. drama_path/subdir_name（旧格式）
         2. drama_path/original/subdir_name（新格式）
         
+        layout 为 'flat' 或 'original' 时只检查对应格式的路径。
+        
         Args:
             drama_path: 短剧目录路径
             subdir_name: 子目录名称
+            has_original: 已知的 original/ 是否存在；为 False 时跳过
+                    original/ 分支，为 None 时照常探测
             
         Returns:
             子目录是否存在
         """
+        # 使用字符串路径拼接，避免为每次探测构造 Path 对象
+        drama_path_str = os.fspath(drama_path)
+        
+        layout = self.layout
+        if layout == 'flat':
+            return self._is_dir(os.path.join(drama_path_str, subdir_name))
+        if layout == 'original':
+            return self._is_dir(os.path.join(drama_path_str, "original", subdir_name))
+        
         # 首先检查 original/ 子目录（新格式）
-        original_subdir = drama_path / "original" / subdir_name
-        if original_subdir.exists() and original_subdir.is_dir():
-            return True
+        if has_original is not False:
+            original_subdir = os.path.join(drama_path_str, "original", subdir_name)
+            if self._is_dir(original_subdir):
+                return True
         
         # 回退到直接子目录（旧格式）
-        direct_subdir = drama_path / subdir_name
-        return direct_subdir.exists() and direct_subdir.is_dir()
+        direct_subdir = os.path.join(drama_path_str, subdir_name)
+        return self._is_dir(direct_subdir)
     
-    def _create_drama_directory(self, path: Path) -> DramaDirectory:
-        """创建 DramaDirectory 对象
+    @staticmethod
+    def _is_dir(path: str) -> bool:
+        """判断路径是否为目录
         
-        检查目录结构并创建对应的数据对象。
+        使用 os.path.isdir：单次 stat，路径不存在时返回 False，无需先 exists()。
         
         Args:
-            path: 短剧目录路径
+            path: 待检查的路径
             
         Returns:
-            DramaDirectory 对象，包含目录结构信息
+            路径是否为已存在的目录
         """
-        return DramaDirectory(
-            path=path,
-            name=path.name,
-            has_video_dir=self._check_subdirectory(path, 'video'),
-            has_srt_dir=self._check_subdirectory(path, 'srt'),
-            has_merged_dir=self._check_subdirectory(path, 'merged'),
-            has_cleared_dir=self._check_subdirectory(path, 'cleared')
-        )
+        return os.path.isdir(path)
     
-    def scan_drama_root(self, root_path: Path) -> List[DramaDirectory]:
-        """扫描 drama/ 根目录
+    @staticmethod
+    def _collect_subdirs(path: str, wanted: FrozenSet[str]) -> Optional[Set[str]]:
+        """通过一次 scandir 收集目录下指定名称的子目录
         
-        识别所有符合 drama-XXXX 命名模式的子目录，并检查其目录结构。
+        先做名称的集合成员判断，只有名称命中的条目才检查文件类型。
         
-        验证需求 5.1：识别所有符合 drama-XXXX 命名模式的子目录
+        Args:
+            path: 目录路径
+            wanted: 需要检测的子目录名集合
+            
+        Returns:
+            存在的子目录名集合（wanted 的子集）；
+            如果目录无法列出（不存在、无读权限等）则返回 None
+        """
+        try:
+            with os.scandir(path) as it:
+                return {
+                    entry.name for entry in it
+                    if entry.name in wanted and entry.is_dir()
+                }
+        except OSError:
+            return None
+    
+    def _probe_drama_directory(self, drama_dir: DramaDirectory) -> None:
+        """检测短剧目录的子目录结构并填充到 DramaDirectory
+        
+        每个短剧目录只列出一次（存在 original/ 时再列出一次），
+        用集合成员判断代替逐个子目录的 stat 探测。
+        layout 为 'flat' 或 'original' 时只列出对应格式的目录。
+        
+        Args:
+            drama_dir: 待检测的短剧目录
+        """
+        path = drama_dir.path
+        path_str = os.fspath(path)
+        layout = self.layout
+        
+        if layout == 'original':
+            direct: Optional[Set[str]] = set()
+            original = self._collect_subdirs(
+                os.path.join(path_str, 'original'), _REQUIRED_SUBDIRS
+            )
+        elif layout == 'flat':
+            direct = self._collect_subdirs(path_str, _REQUIRED_SUBDIRS)
+            original = set()
+        else:
+            direct = self._collect_subdirs(path_str, _TOP_LEVEL_SUBDIRS)
+            if direct is not None and 'original' in direct:
+                original = self._collect_subdirs(
+                    os.path.join(path_str, 'original'), _REQUIRED_SUBDIRS
+                )
+            else:
+                original = set()
+        
+        if direct is None or original is None:
+            # 目录无法列出时回退到逐个探测；auto 布局下 original/ 是否存在
+            # 只探测一次，不存在时四个子目录都直接检查旧格式路径
+            # （其他布局由 _check_subdirectory 自行只检查一个位置）
+            if layout != 'auto':
+                has_original = None
+            elif direct is None:
+                has_original = self._is_dir(os.path.join(path_str, 'original'))
+            else:
+                has_original = True
+            check = self._check_subdirectory
+            drama_dir.has_video_dir = check(path, 'video', has_original)
+            drama_dir.has_srt_dir = check(path, 'srt', has_original)
+            drama_dir.has_merged_dir = check(path, 'merged', has_original)
+            drama_dir.has_cleared_dir = check(path, 'cleared', has_original)
+            return
+        
+        drama_dir.has_video_dir = 'video' in original or 'video' in direct
+        drama_dir.has_srt_dir = 'srt' in original or 'srt' in direct
+        drama_dir.has_merged_dir = 'merged' in original or 'merged' in direct
+        drama_dir.has_cleared_dir = 'cleared' in original or 'cleared' in direct
+    
+    def _probe_all(self, drama_dirs: List[DramaDirectory]) -> None:
+        """批量检测尚未检测的短剧目录
+        
+        子目录检测完全是 I/O（scandir/stat 调用会释放 GIL），
+        目录较多时用线程池并发执行以重叠系统调用延迟。
+        
+        Args:
+            drama_dirs: 短剧目录列表
+        """
+        pending = [d for d in drama_dirs if d.has_video_dir is None]
+        
+        if len(pending) < _PARALLEL_PROBE_MIN or self.max_workers <= 1:
+            for drama_dir in pending:
+                self._probe_drama_directory(drama_dir)
+            return
+        
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            # 消费迭代器以传播异常；结果直接写回各 DramaDirectory
+            for _ in executor.map(self._probe_drama_directory, pending):
+                pass
+    
+    def _list_candidates(self, root_path: Path) -> List[Path]:
+        """列出根目录下所有符合命名模式的子目录
         
         Args:
             root_path: drama/ 根目录路径
             
         Returns:
-            短剧目录列表，按目录名排序
+            候选短剧目录路径列表
+        """
+        match = self._match
+        
+        # 使用 os.scandir：DirEntry 会缓存 readdir 返回的文件类型，
+        # 避免 Path.iterdir() + is_dir() 对每个条目额外的 stat 调用。
+        # 先检查名称（纯字符串比较），不符合 drama-XXXX 模式的条目
+        # 直接跳过；只有名称命中的条目才检查类型（符号链接等 d_type
+        # 不确定的条目才会触发 stat）。
+        # 用推导式一次构造列表，省去逐个 append 的方法调用
+        with os.scandir(root_path) as it:
+            candidates: List[Path] = [
+                Path(entry.path) for entry in it
+                if match(entry.name) and entry.is_dir()
+            ]
+        
+        # 按目录名排序（drama-0001 在 drama-0002 之前）；
+        # 列表随缓存复用，排序只在重新列出目录时进行一次
+        candidates.sort(key=_BY_NAME)
+        
+        return candidates
+    
+    @staticmethod
+    def _stat_root(root_path: Path) -> os.stat_result:
+        """校验根目录并返回其 stat 结果（一次 stat 同时用于校验和缓存判断）
+        
+        Args:
+            root_path: drama/ 根目录路径
+            
+        Returns:
+            根目录的 stat 结果
             
         Raises:
             FileNotFoundError: 如果根目录不存在
             NotADirectoryError: 如果路径不是目录
         """
-        # 验证根目录
-        if not root_path.exists():
+        try:
+            root_stat = os.stat(root_path)
+        except FileNotFoundError:
             raise FileNotFoundError(f"根目录不存在: {root_path}")
         
-        if not root_path.is_dir():
+        if not stat.S_ISDIR(root_stat.st_mode):
             raise NotADirectoryError(f"路径不是目录: {root_path}")
         
-        drama_dirs: List[DramaDirectory] = []
+        return root_stat
+    
+    def iter_drama_root(self, root_path: Path) -> Iterator[DramaDirectory]:
+        """逐个产出 drama/ 根目录下的短剧目录
+        
+        边读取目录边产出，不构造完整列表、不排序，也不读写扫描缓存，
+        适合只需遍历一次的调用方，例如：
+        
+            sum(1 for d in scanner.iter_drama_root(root)
+                if scanner.validate_for_merge(d))
+        
+        产出顺序取决于文件系统，需要确定顺序时使用 scan_drama_root。
+        
+        Args:
+            root_path: drama/ 根目录路径
+            
+        Yields:
+            短剧目录（子目录结构在 validate_for_* 首次需要时才检测）
+            
+        Raises:
+            FileNotFoundError: 如果根目录不存在
+            NotADirectoryError: 如果路径不是目录
+        """
+        self._stat_root(root_path)
+        match = self._match
+        
+        with os.scandir(root_path) as it:
+            for entry in it:
+                if match(entry.name) and entry.is_dir():
+                    yield DramaDirectory(path=Path(entry.path), name=entry.name)
+    
+    def scan_drama_root(self, root_path: Path) -> List[DramaDirectory]:
+        """扫描 drama/ 根目录
+        
+        识别所有符合 drama-XXXX 命名模式的子目录。
+        返回的 DramaDirectory 只包含路径和名称，子目录结构在
+        validate_for_* 首次需要时才检测（每个目录一次）。
+        根目录的 mtime 未变化时复用上次列出的目录。
         
-        # 遍历根目录下的所有子目录
-        for item in root_path.iterdir():
-            # 只处理目录
-            if not item.is_dir():
-                continue
+        验证需求 5.1：识别所有符合 drama-XXXX 命名模式的子目录
+        
+        Args:
+            root_path: drama/ 根目录路径
+            
+        Returns:
+            短剧目录列表，按目录名排序
             
-            # 检查目录名是否符合 drama-XXXX 模式
-            if self._is_valid_drama_dir_name(item.name):
-                drama_dir = self._create_drama_directory(item)
-                drama_dirs.append(drama_dir)
+        Raises:
+            FileNotFoundError: 如果根目录不存在
+            NotADirectoryError: 如果路径不是目录
+        """
+        root_key = os.fspath(root_path)
+        root_stat = self._stat_root(root_path)
+        
+        # 根目录未变化时复用上次的目录列表
+        cached = self._scan_cache.get(root_key)
+        if cached is not None and cached[0] == root_stat.st_mtime_ns:
+            candidates = cached[1]
+        else:
+            candidates = self._list_candidates(root_path)
+            self._scan_cache[root_key] = (root_stat.st_mtime_ns, candidates)
         
-        # 按目录名排序（自然排序，drama-0001 在 drama-0002 之前）
-        drama_dirs.sort(key=lambda d: d.name)
+        # candidates 已按目录名排序，结果顺序与之一致；
+        # 子目录结构延迟到 validate_for_* 时再检测
+        drama_dirs: List[DramaDirectory] = [
+            DramaDirectory(path=path, name=path.name) for path in candidates
+        ]
         
         return drama_dirs
     
@@ -163,6 +446,8 @@ class DirectoryScanner:
             是否可以执行合并操作（video/ 目录必须存在）
         """
         # video/ 目录是必需的
+        if drama_dir.has_video_dir is None:
+            self._probe_drama_directory(drama_dir)
         return drama_dir.has_video_dir
     
     def validate_for_separation(self, drama_dir: DramaDirectory) -> bool:
@@ -178,6 +463,8 @@ class DirectoryScanner:
         Returns:
             是否可以执行音频分离操作
         """
+        if drama_dir.has_merged_dir is None:
+            self._probe_drama_directory(drama_dir)
         return drama_dir.has_merged_dir
     
     def validate_for_transcode(self, drama_dir: DramaDirectory) -> bool:
@@ -193,55 +480,92 @@ class DirectoryScanner:
         Returns:
             是否可以执行转码操作
         """
+        if drama_dir.has_cleared_dir is None:
+            self._probe_drama_directory(drama_dir)
         return drama_dir.has_cleared_dir
     
     def get_valid_dirs_for_merge(
         self, 
         drama_dirs: List[DramaDirectory]
-    ) -> List[DramaDirectory]:
+    ) -> Sequence[DramaDirectory]:
         """获取所有适合合并操作的目录
         
         Args:
             drama_dirs: 短剧目录列表
             
         Returns:
-            适合合并操作的目录列表
+            适合合并操作的目录（元组）
         """
-        return [d for d in drama_dirs if self.validate_for_merge(d)]
+        # _probe_all 之后所有目录都已检测，直接读取字段，省去 validate_for_* 的调用
+        self._probe_all(drama_dirs)
+        return tuple(d for d in drama_dirs if d.has_video_dir)
     
     def get_valid_dirs_for_separation(
         self, 
         drama_dirs: List[DramaDirectory]
-    ) -> List[DramaDirectory]:
+    ) -> Sequence[DramaDirectory]:
         """获取所有适合音频分离操作的目录
         
         Args:
             drama_dirs: 短剧目录列表
             
         Returns:
-            适合音频分离操作的目录列表
+            适合音频分离操作的目录（元组）
         """
-        return [d for d in drama_dirs if self.validate_for_separation(d)]
+        self._probe_all(drama_dirs)
+        return tuple(d for d in drama_dirs if d.has_merged_dir)
     
     def get_valid_dirs_for_transcode(
         self, 
         drama_dirs: List[DramaDirectory]
-    ) -> List[DramaDirectory]:
+    ) -> Sequence[DramaDirectory]:
         """获取所有适合转码操作的目录
         
         Args:
             drama_dirs: 短剧目录列表
             
         Returns:
-            适合转码操作的目录列表
+            适合转码操作的目录（元组）
         """
-        return [d for d in drama_dirs if self.validate_for_transcode(d)]
+        self._probe_all(drama_dirs)
+        return tuple(d for d in drama_dirs if d.has_cleared_dir)
+    
+    def partition(
+        self,
+        drama_dirs: List[DramaDirectory]
+    ) -> Tuple[List[DramaDirectory], List[DramaDirectory], List[DramaDirectory]]:
+        """一次遍历按可执行的操作划分目录
+        
+        需要多个类别时使用，代替分别调用三个 get_valid_dirs_for_* 方法
+        （每个方法都会遍历一次完整列表）。
+        
+        Args:
+            drama_dirs: 短剧目录列表
+            
+        Returns:
+            (适合合并的目录, 适合音频分离的目录, 适合转码的目录)
+        """
+        self._probe_all(drama_dirs)
+        
+        merge: List[DramaDirectory] = []
+        separation: List[DramaDirectory] = []
+        transcode: List[DramaDirectory] = []
+        
+        for d in drama_dirs:
+            if d.has_video_dir:
+                merge.append(d)
+            if d.has_merged_dir:
+                separation.append(d)
+            if d.has_cleared_dir:
+                transcode.append(d)
+        
+        return merge, separation, transcode
     
     def scan_and_validate(
         self, 
         root_path: Path, 
         operation: str
-    ) -> List[DramaDirectory]:
+    ) -> Sequence[DramaDirectory]:
         """扫描并验证目录，返回适合指定操作的目录列表
         
         这是一个便捷方法，结合了扫描和验证功能。
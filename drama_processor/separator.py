@@ -4,18 +4,227 @@
 去除背景音乐，保留人声对话。
 """
 
+import logging
+import math
+import os
 import shutil
 import subprocess
 import tempfile
+import threading
 import time
+import wave
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import Dict, Iterator, List, Literal, Optional, Tuple
 
 from .interfaces import VideoProcessor, ProgressCallback
 from .models import ProcessingResult, ProcessingStatus, ProgressInfo
 from .ffmpeg_wrapper import FFmpegWrapper, FFmpegCommand, FFmpegError
 from .file_manager import FileManager
 from .logger import ProcessingLogger
+from .progress import LockedProgressCallback
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import soundfile as sf
+except ImportError:
+    sf = None
+
+
+# 超过该时长（秒）的音频分段处理，以降低 Spleeter 的内存占用
+LONG_AUDIO_THRESHOLD = 600
+
+# 分段处理时每段的时长（秒）
+SEGMENT_SECONDS = 480
+
+# 分段处理时相邻片段的重叠时长（秒），重叠部分交叉淡化以消除拼接处的咔哒声
+SEGMENT_OVERLAP_SECONDS = 5
+
+# 分离后端：Spleeter（TensorFlow）或 audio-separator（ONNX Runtime / PyTorch）
+SeparatorBackend = Literal['spleeter', 'audio-separator']
+
+# audio-separator 后端的默认模型（MDX-Net，人声/伴奏两轨）
+AUDIO_SEPARATOR_DEFAULT_MODEL = "UVR-MDX-NET-Inst_HQ_3.onnx"
+
+# 解码及分离时使用的采样率和声道数（与 Spleeter 模型一致）
+_SAMPLE_RATE = 44100
+_CHANNELS = 2
+
+# 语音模式下中间 WAV 的采样率和声道数
+_SPEECH_SAMPLE_RATE = 16000
+_SPEECH_CHANNELS = 1
+
+# 单个 Spleeter 进程处理一段音频的峰值内存估计（GB）
+_SPLEETER_MEMORY_GB = 4
+
+# 处理一个短剧目录（Spleeter + FFmpeg）的峰值内存估计（GB）
+_DRAMA_MEMORY_GB = 5
+
+# 在内存中混合的 WAV 文件大小上限（字节）：约为长音频阈值对应的 16 位
+# 双声道 PCM 大小，更长的音频交给 FFmpeg 流式混合
+_IN_MEMORY_MIX_MAX_BYTES = LONG_AUDIO_THRESHOLD * _SAMPLE_RATE * _CHANNELS * 2
+
+# FFmpeg 混合人声和伴奏时的滤镜：amix 默认将每路输入除以输入数（2），
+# 内存中混合时按同样的比例缩放（见 _mix_tracks），两条路径的响度一致
+_MIX_FILTER = '[0:a]volume=1.0[v];[1:a]volume={bg_volume}[b];[v][b]amix=inputs=2:duration=first'
+_MIX_SCALE = 0.5
+
+
+def _limit_by_memory(workers: int, per_worker_gb: int) -> int:
+    """按当前可用内存限制并发数
+    
+    无法获取内存信息（未安装 psutil）时不做限制。
+    
+    Args:
+        workers: 期望的并发数
+        per_worker_gb: 每个任务的峰值内存估计（GB）
+        
+    Returns:
+        并发数（至少为 1）
+    """
+    if psutil is not None:
+        available_gb = psutil.virtual_memory().available // (1024 ** 3)
+        workers = min(workers, available_gb // per_worker_gb)
+    return max(1, workers)
+
+
+def _mix_tracks(vocal, background, bg_volume: float):
+    """按伴奏音量把伴奏叠加到人声上（原地修改 vocal）
+    
+    与 FFmpeg 的 _MIX_FILTER 保持相同的增益：两路之和乘以 _MIX_SCALE。
+    以人声时长为准，伴奏较短时其余部分只有人声（与 amix 在伴奏结束后
+    的稳定状态一致），较长时截断。
+    
+    Args:
+        vocal: 人声采样数组（帧数 x 声道数），必须可写
+        background: 伴奏采样数组，声道数与 vocal 相同
+        bg_volume: 伴奏音量（0.0-1.0）
+        
+    Returns:
+        混合后的 vocal，已限制在 [-1.0, 1.0] 内
+    """
+    n = min(len(vocal), len(background))
+    head = vocal[:n]
+    if bg_volume == 1.0:
+        np.add(head, background[:n], out=head)
+    else:
+        head += bg_volume * background[:n]
+    head *= _MIX_SCALE
+    np.clip(vocal, -1.0, 1.0, out=vocal)
+    return vocal
+
+
+def _default_segment_workers() -> int:
+    """估计可以同时运行的 Spleeter 进程数
+    
+    不超过 CPU 核数的一半，且按每个进程约 4GB 内存限制并发数。
+    
+    Returns:
+        并发进程数（至少为 1）
+    """
+    return _limit_by_memory((os.cpu_count() or 1) // 2, _SPLEETER_MEMORY_GB)
+
+
+def _has_gpu() -> bool:
+    """粗略判断本机是否有可用的 NVIDIA GPU
+    
+    Returns:
+        存在 nvidia-smi 且 CUDA_VISIBLE_DEVICES 没有屏蔽所有设备时返回 True
+    """
+    visible = os.environ.get('CUDA_VISIBLE_DEVICES')
+    if visible is not None and visible.strip() in ('', '-1'):
+        return False
+    return shutil.which('nvidia-smi') is not None
+
+
+def _spleeter_env(concurrency: int) -> Dict[str, str]:
+    """构建 spleeter 子进程的环境变量
+    
+    TensorFlow 默认会占满全部显存，并按 CPU 核数创建线程池；多个
+    spleeter 进程同时运行时容易显存不足或线程争抢。这里让显存按需
+    增长、降低日志级别，并按同时运行的进程数分配计算线程。
+    用户已设置的同名变量保持不变。
+    
+    Args:
+        concurrency: 同时运行的 spleeter 进程数
+    
+    Returns:
+        子进程环境变量
+    """
+    threads = str(max(1, (os.cpu_count() or 1) // max(2, concurrency)))
+    env = os.environ.copy()
+    env.setdefault('TF_CPP_MIN_LOG_LEVEL', '2')
+    env.setdefault('OMP_NUM_THREADS', threads)
+    env.setdefault('TF_NUM_INTRAOP_THREADS', threads)
+    env.setdefault('TF_NUM_INTEROP_THREADS', '2')
+    if _has_gpu():
+        env.setdefault('TF_FORCE_GPU_ALLOW_GROWTH', 'true')
+    return env
+
+
+def _list_files(directory: Path) -> Dict[str, Path]:
+    """一次 scandir 列出目录下的所有普通文件
+    
+    Args:
+        directory: 目录路径
+        
+    Returns:
+        文件名到路径的映射；目录无法列出时返回空字典
+    """
+    try:
+        with os.scandir(directory) as it:
+            return {entry.name: Path(entry.path) for entry in it if entry.is_file()}
+    except OSError:
+        return {}
+
+
+def _find_input_video(merged_files: Dict[str, Path]) -> Optional[Path]:
+    """从 merged/ 的文件列表中选出要处理的视频
+    
+    Args:
+        merged_files: _list_files 返回的文件名到路径的映射
+        
+    Returns:
+        按文件名排序后的第一个 .mp4 文件（通常是 merged.mp4），没有时返回 None
+    """
+    video_files = sorted(
+        path for name, path in merged_files.items()
+        if name.endswith(".mp4") and not name.startswith(".")
+    )
+    return video_files[0] if video_files else None
+
+
+@lru_cache(maxsize=1024)
+def _probe_duration(path_str: str, mtime_ns: int, size: int, kind: str) -> float:
+    """探测文件时长（带缓存）
+    
+    mtime_ns 和 size 只作为缓存键的一部分：文件被重写后键随之变化，
+    不会返回过期的时长。探测失败时抛出异常，不会被缓存。
+    
+    Args:
+        path_str: 文件路径
+        mtime_ns: 文件修改时间（纳秒）
+        size: 文件大小（字节）
+        kind: 'audio' 或 'video'
+        
+    Returns:
+        时长（秒）
+    """
+    wrapper = FFmpegWrapper()
+    if kind == 'video':
+        return wrapper.get_video_duration(Path(path_str))
+    return wrapper.get_audio_duration(Path(path_str))
 
 
 class AudioSeparationError(Exception):
@@ -34,6 +243,9 @@ class AudioSeparator(VideoProcessor):
     - spleeter:4stems - 人声、鼓、贝斯、其他
     - spleeter:5stems - 人声、鼓、贝斯、钢琴、其他
     
+    backend="audio-separator" 时使用 audio-separator 的 MDX-Net 等模型
+    （默认 UVR-MDX-NET-Inst_HQ_3.onnx），model 为其模型文件名。
+    
     Attributes:
         ffmpeg: FFmpeg 包装器实例
         file_manager: 文件管理器实例
@@ -46,7 +258,11 @@ class AudioSeparator(VideoProcessor):
         model: str = "spleeter:2stems",
         accompaniment_volume: float = 0.0,
         log_file: Optional[Path] = None,
-        log_level: str = "INFO"
+        log_level: str = "INFO",
+        segment_workers: Optional[int] = None,
+        batch_workers: int = 2,
+        backend: SeparatorBackend = "spleeter",
+        speech_mode: bool = False
     ):
         """初始化音频分离器
         
@@ -62,14 +278,55 @@ class AudioSeparator(VideoProcessor):
                   - 1.0: 保留100%伴奏音量（相当于不处理）
             log_file: 日志文件路径（可选）
             log_level: 日志级别
+            segment_workers: 长音频分段处理时同时运行的 Spleeter 进程数，
+                  默认根据 CPU 核数和可用内存估计；设为 1 则逐段处理
+            batch_workers: 批量处理时同时处理的短剧目录数（默认 2），
+                  实际并发数还会按每个目录约 5GB 内存受可用内存限制；
+                  设为 1 则逐个处理
+            backend: 分离后端，"spleeter"（默认）或 "audio-separator"；
+                  使用 audio-separator 时若 model 仍为 spleeter 模型，
+                  则改用 AUDIO_SEPARATOR_DEFAULT_MODEL
+            speech_mode: 语音模式，只保留对白时可开启。提取的中间 WAV
+                  及混合输出使用 16kHz 单声道（约为默认格式的 1/5 大小）。
+                  注意 16kHz 采样会把音频带宽限制在 8kHz 以内，高频的音乐和
+                  音效会被滤掉。分离模型不变：Spleeter 总是把输入重采样到
+                  44.1kHz，名称带 16kHz 的模型只是覆盖更宽的频带，更慢且
+                  更占内存，对已限制在 8kHz 以内的音频没有好处
+                  
+        Raises:
+            ValueError: 如果 backend 不是支持的取值
         """
+        if backend not in ('spleeter', 'audio-separator'):
+            raise ValueError(f"不支持的分离后端: {backend}")
+        
         self.ffmpeg = FFmpegWrapper()
         self.file_manager = FileManager()
         self.logger = ProcessingLogger(log_file, log_level)
+        self.backend = backend
+        if backend == 'audio-separator' and model.startswith('spleeter:'):
+            model = AUDIO_SEPARATOR_DEFAULT_MODEL
         self.model = model
+        self.speech_mode = speech_mode
+        # 提取的中间 WAV 的采样率和声道数
+        self._extract_rate = _SPEECH_SAMPLE_RATE if speech_mode else _SAMPLE_RATE
+        self._extract_channels = _SPEECH_CHANNELS if speech_mode else _CHANNELS
         self.accompaniment_volume = max(0.0, min(1.0, accompaniment_volume))  # 限制在0-1之间
+        self.segment_workers = segment_workers or _default_segment_workers()
+        self.batch_workers = max(1, batch_workers)
         self._separator_checked = False  # 延迟检查标志
-        self._print_tensorflow_gpu_status()
+        # Spleeter Python API 的 Separator 实例（可用时在首次处理前创建），
+        # 所有片段复用同一个模型，避免每段启动 spleeter 进程并重新加载模型
+        self._spleeter = None
+        # audio-separator 的 Separator 实例及其固定的输出目录
+        self._audio_separator = None
+        self._audio_separator_dir: Optional[Path] = None
+        self._separator_lock = threading.Lock()
+        # process_batch 期间所有目录共用的临时目录
+        self._batch_tmp: Optional[Path] = None
+        # process_batch 开始时批量分离得到的结果：输入视频 -> 人声文件
+        self._preseparated: Dict[Path, Path] = {}
+        if backend == 'spleeter':
+            self._print_tensorflow_gpu_status()
     
     def _print_tensorflow_gpu_status(self) -> None:
         """打印 TensorFlow GPU 状态"""
@@ -105,12 +362,38 @@ class AudioSeparator(VideoProcessor):
         
         print("="*60 + "\n")
     
+    @property
+    def _in_process(self) -> bool:
+        """是否使用进程内常驻的分离模型（而不是 spleeter 命令行工具）"""
+        return self._spleeter is not None or self._audio_separator is not None
+    
     def _check_separator_available(self) -> None:
         """检查音频分离工具是否可用
         
+        优先使用 Spleeter 的 Python API（进程内常驻模型），
+        无法导入时回退到检查 spleeter 命令行工具。
+        backend 为 "audio-separator" 时创建 audio-separator 分离器并加载模型。
+        
         Raises:
             AudioSeparationError: 如果音频分离工具不可用
         """
+        if self.backend == 'audio-separator':
+            self._load_audio_separator()
+            return
+        
+        try:
+            from spleeter.separator import Separator
+        except ImportError:
+            Separator = None
+        
+        if Separator is not None:
+            try:
+                self._spleeter = Separator(self.model, multiprocess=False)
+                self.logger.logger.info(f"使用 Spleeter Python API（模型: {self.model}）")
+                return
+            except Exception as e:
+                self.logger.logger.warning(f"无法创建 Spleeter 分离器: {e}，改用命令行工具")
+        
         try:
             result = subprocess.run(
                 ['spleeter', '--help'],
@@ -128,7 +411,116 @@ class AudioSeparator(VideoProcessor):
         except subprocess.TimeoutExpired:
             pass
     
-    def extract_audio(self, video_path: Path) -> Path:
+    def _load_audio_separator(self) -> None:
+        """创建 audio-separator 分离器并加载模型
+        
+        分离器的输出目录在创建时固定，使用一个私有的临时目录，
+        分离完成后再把结果移动到调用方指定的位置。
+        
+        Raises:
+            AudioSeparationError: 如果 audio-separator 不可用或模型加载失败
+        """
+        try:
+            from audio_separator.separator import Separator
+        except ImportError:
+            raise AudioSeparationError(
+                "未找到 audio-separator。请运行: pip install \"audio-separator[cpu]\""
+            )
+        
+        output_dir = Path(tempfile.mkdtemp(prefix='drama_as_'))
+        try:
+            try:
+                separator = Separator(
+                    output_dir=str(output_dir),
+                    output_format='WAV',
+                    chunk_duration=SEGMENT_SECONDS
+                )
+            except TypeError:
+                # 较早的版本不支持 chunk_duration
+                separator = Separator(output_dir=str(output_dir), output_format='WAV')
+            separator.load_model(model_filename=self.model)
+        except Exception as e:
+            shutil.rmtree(output_dir, ignore_errors=True)
+            raise AudioSeparationError(f"无法加载 audio-separator 模型 {self.model}: {e}")
+        
+        self._audio_separator = separator
+        self._audio_separator_dir = output_dir
+        self.logger.logger.info(f"使用 audio-separator（模型: {self.model}）")
+    
+    def _run_audio_separator(self, audio_path: Path, output_dir: Path) -> None:
+        """通过 audio-separator 分离音频
+        
+        输出整理为与 Spleeter 相同的结构：
+        output_dir/音频名/vocals.wav 和 accompaniment.wav
+        
+        Args:
+            audio_path: 音频文件路径
+            output_dir: 输出目录
+        """
+        separated_dir = output_dir / audio_path.stem
+        separated_dir.mkdir(parents=True, exist_ok=True)
+        
+        self.logger.logger.info(f"audio-separator 分离: {audio_path.name}")
+        
+        try:
+            with self._separator_lock:
+                output_files = self._audio_separator.separate(str(audio_path))
+                
+                for output_file in output_files:
+                    output_path = Path(output_file)
+                    if not output_path.is_absolute():
+                        output_path = self._audio_separator_dir / output_path
+                    
+                    # 输出文件名形如 "<音频名>_(Vocals)_<模型名>.wav"
+                    if '(Vocals)' in output_path.name:
+                        target = separated_dir / 'vocals.wav'
+                    elif '(Instrumental)' in output_path.name:
+                        target = separated_dir / 'accompaniment.wav'
+                    else:
+                        output_path.unlink(missing_ok=True)
+                        continue
+                    shutil.move(str(output_path), str(target))
+        except Exception as e:
+            raise AudioSeparationError(f"audio-separator 执行错误: {str(e)}")
+    
+    def _get_duration(self, path: Path, kind: str = 'audio') -> float:
+        """获取文件时长，同一文件只调用一次 ffprobe
+        
+        Args:
+            path: 音频或视频文件路径
+            kind: 'audio' 按格式时长探测，'video' 按视频信息探测
+            
+        Returns:
+            时长（秒）
+            
+        Raises:
+            FFmpegError: 当无法获取时长时
+        """
+        try:
+            st = path.stat()
+        except OSError:
+            # 文件不存在等情况交给 ffmpeg 包装器给出原有的错误信息
+            if kind == 'video':
+                return self.ffmpeg.get_video_duration(path)
+            return self.ffmpeg.get_audio_duration(path)
+        return _probe_duration(str(path), st.st_mtime_ns, st.st_size, kind)
+    
+    def _pcm_options(self) -> List[str]:
+        """提取中间 WAV 及混合人声和伴奏时使用的 FFmpeg 编码选项
+        
+        默认为 PCM 16-bit、44.1kHz 双声道；语音模式下为 16kHz 单声道
+        （带宽限制在 8kHz 以内）。
+        
+        Returns:
+            FFmpeg 选项列表
+        """
+        return [
+            '-acodec', 'pcm_s16le',
+            '-ar', str(self._extract_rate),
+            '-ac', str(self._extract_channels)
+        ]
+    
+    def extract_audio(self, video_path: Path, output_path: Optional[Path] = None) -> Path:
         """从视频中提取音频
         
         使用 FFmpeg 从视频文件中提取音频轨道，保存为 WAV 格式。
@@ -136,6 +528,8 @@ class AudioSeparator(VideoProcessor):
         
         Args:
             video_path: 视频文件路径
+            output_path: 输出音频文件路径，默认为视频所在目录下的
+                        {视频名}_audio.wav
             
         Returns:
             提取的音频文件路径（WAV 格式）
@@ -147,7 +541,7 @@ class AudioSeparator(VideoProcessor):
             raise FFmpegError(f"视频文件不存在: {video_path}")
         
         # 创建临时音频文件
-        audio_path = video_path.parent / f"{video_path.stem}_audio.wav"
+        audio_path = output_path or video_path.parent / f"{video_path.stem}_audio.wav"
         
         # 构建 FFmpeg 命令：提取音频为 WAV 格式
         command = FFmpegCommand(
@@ -155,9 +549,7 @@ class AudioSeparator(VideoProcessor):
             output=audio_path,
             options=[
                 '-vn',           # 不处理视频流
-                '-acodec', 'pcm_s16le',  # 使用 PCM 16-bit 编码
-                '-ar', '44100',  # 采样率 44.1kHz
-                '-ac', '2',      # 双声道
+                *self._pcm_options(),
                 '-y'             # 覆盖输出文件
             ]
         )
@@ -166,6 +558,54 @@ class AudioSeparator(VideoProcessor):
         
         return audio_path
     
+    def extract_audio_segments(
+        self,
+        source_path: Path,
+        segments_dir: Path,
+        segment_seconds: int = SEGMENT_SECONDS
+    ) -> List[Path]:
+        """从视频或音频中提取音频并切分为多个 WAV 片段
+        
+        使用 FFmpeg 的 segment 封装器一次完成解码和切分，源文件可以
+        直接是视频，不需要先写出完整的 WAV 再逐段重新读取。
+        
+        Args:
+            source_path: 视频或音频文件路径
+            segments_dir: 片段输出目录
+            segment_seconds: 每段时长（秒）
+            
+        Returns:
+            按时间顺序排列的片段路径列表（segment_000.wav, segment_001.wav, ...）
+            
+        Raises:
+            FFmpegError: 当音频提取或切分失败时
+        """
+        if not source_path.exists():
+            raise FFmpegError(f"文件不存在: {source_path}")
+        
+        segments_dir.mkdir(parents=True, exist_ok=True)
+        
+        command = FFmpegCommand(
+            inputs=[source_path],
+            output=segments_dir / "segment_%03d.wav",
+            options=[
+                '-vn',
+                *self._pcm_options(),
+                '-f', 'segment',
+                '-segment_time', str(segment_seconds),
+                '-reset_timestamps', '1',  # 每个片段的时间戳从 0 开始
+                '-y'
+            ]
+        )
+        
+        self.ffmpeg.execute(command)
+        
+        segments = sorted(segments_dir.glob("segment_*.wav"))
+        if not segments:
+            raise FFmpegError(f"音频切分未生成任何片段: {source_path}")
+        
+        return segments
+    
     def separate_vocals(self, audio_path: Path) -> Tuple[Path, Path]:
         """分离人声和背景音乐
         
@@ -176,7 +616,9 @@ class AudioSeparator(VideoProcessor):
             audio_path: 音频文件路径（WAV 格式）
             
         Returns:
-            (vocal_path, background_path) 人声和背景音乐的文件路径
+            (vocal_path, background_path) 人声和背景音乐的文件路径；
+            分段处理且未安装 numpy/soundfile 时为 ffconcat 片段列表，
+            可直接作为 FFmpeg 的输入
             
         Raises:
             AudioSeparationError: 当音频分离失败时
@@ -186,7 +628,7 @@ class AudioSeparator(VideoProcessor):
         
         # 获取音频时长
         try:
-            duration = self.ffmpeg.get_audio_duration(audio_path)
+            duration = self._get_duration(audio_path)
             self.logger.logger.info(f"音频时长: {duration:.2f}秒")
         except Exception as e:
             self.logger.logger.warning(f"无法获取音频时长: {e}，使用默认处理方式")
@@ -198,11 +640,11 @@ class AudioSeparator(VideoProcessor):
         
         try:
             # 如果音频超过10分钟（600秒），分段处理以降低内存占用
-            if duration > 600:
+            if duration > LONG_AUDIO_THRESHOLD:
                 self.logger.logger.info(f"音频较长（{duration:.0f}秒），将分段处理以降低内存占用")
                 return self._separate_long_audio(audio_path, output_dir, duration)
             else:
-                return self._separate_with_spleeter(audio_path, output_dir)
+                return self._separate_with_spleeter(audio_path, output_dir, duration)
         except Exception as e:
             # 清理临时目录
             if output_dir.exists():
@@ -215,28 +657,122 @@ class AudioSeparator(VideoProcessor):
     def _separate_with_spleeter(
         self, 
         audio_path: Path, 
-        output_dir: Path
+        output_dir: Path,
+        duration: Optional[float] = None
     ) -> Tuple[Path, Path]:
         """使用 Spleeter 分离音频
         
         Args:
             audio_path: 音频文件路径
             output_dir: 输出目录
+            duration: 调用方已知的音频时长（秒），为空时自动探测
             
         Returns:
             (vocal_path, background_path)
         """
         # 获取音频时长，用于设置 Spleeter 的 duration 参数
-        try:
-            audio_duration = self.ffmpeg.get_audio_duration(audio_path)
+        audio_duration = duration or None
+        if audio_duration is None:
+            try:
+                audio_duration = self._get_duration(audio_path)
+            except Exception as e:
+                self.logger.logger.warning(f"无法获取音频时长: {e}，使用默认 duration")
+        
+        if audio_duration is not None:
             # 向上取整，确保处理完整音频
             duration_param = int(audio_duration) + 1
             self.logger.logger.info(f"设置 Spleeter duration={duration_param}")
-        except Exception as e:
-            self.logger.logger.warning(f"无法获取音频时长: {e}，使用默认 duration")
+        else:
             duration_param = None
         
         # 运行 Spleeter
+        if self._audio_separator is not None:
+            self._run_audio_separator(audio_path, output_dir)
+        elif self._spleeter is not None:
+            self._run_spleeter_api(audio_path, output_dir, duration_param)
+        else:
+            self._run_spleeter_cli([audio_path], output_dir, duration_param)
+        
+        # Spleeter 输出结构：output_dir/audio_name/vocals.wav 和 accompaniment.wav
+        separated_dir = output_dir / audio_path.stem
+        vocal_path = separated_dir / 'vocals.wav'
+        background_path = separated_dir / 'accompaniment.wav'
+        
+        if not vocal_path.exists():
+            raise AudioSeparationError(f"未找到人声文件: {vocal_path}")
+        if not background_path.exists():
+            raise AudioSeparationError(f"未找到背景音乐文件: {background_path}")
+        
+        # 检查输出音频的时长
+        try:
+            vocal_duration = self._get_duration(vocal_path)
+            if audio_duration is not None:
+                input_duration = audio_duration
+            else:
+                input_duration = self._get_duration(audio_path)
+            
+            self.logger.logger.info(f"输入音频时长: {input_duration:.2f}秒, 输出人声时长: {vocal_duration:.2f}秒")
+            
+            # 如果输出音频明显短于输入音频，发出警告
+            if vocal_duration < input_duration - 5.0:
+                self.logger.logger.error(
+                    f"Spleeter 输出音频比输入短 {input_duration - vocal_duration:.2f}秒！"
+                )
+        except Exception as e:
+            self.logger.logger.warning(f"无法验证输出音频时长: {e}")
+        
+        # 如果需要混合伴奏，创建混合音频
+        if self.accompaniment_volume > 0:
+            self.logger.logger.info(f"混合人声和伴奏（伴奏音量: {self.accompaniment_volume*100:.0f}%）")
+            mixed_path = output_dir / "mixed.wav"
+            self._mix_audio(vocal_path, background_path, mixed_path, self.accompaniment_volume)
+            return mixed_path, background_path
+        
+        return vocal_path, background_path
+    
+    def _run_spleeter_api(
+        self,
+        audio_path: Path,
+        output_dir: Path,
+        duration_param: Optional[int]
+    ) -> None:
+        """通过进程内的 Spleeter 分离器分离音频
+        
+        模型只在第一次调用时加载，之后的片段直接复用。
+        同一个分离器不保证线程安全，调用之间互斥执行。
+        
+        Args:
+            audio_path: 音频文件路径
+            output_dir: 输出目录
+            duration_param: 处理时长（秒），None 表示使用 Spleeter 默认值
+        """
+        kwargs = {'codec': 'wav'}
+        if duration_param:
+            kwargs['duration'] = duration_param
+        
+        self.logger.logger.info(f"Spleeter 分离: {audio_path.name}")
+        
+        try:
+            with self._separator_lock:
+                self._spleeter.separate_to_file(str(audio_path), str(output_dir), **kwargs)
+        except Exception as e:
+            raise AudioSeparationError(f"Spleeter 执行错误: {str(e)}")
+    
+    def _run_spleeter_cli(
+        self,
+        audio_paths: List[Path],
+        output_dir: Path,
+        duration_param: Optional[int]
+    ) -> None:
+        """通过 spleeter 命令行工具分离音频
+        
+        一次调用可以处理多个音频文件，模型只加载一次。
+        
+        Args:
+            audio_paths: 音频文件路径列表
+            output_dir: 输出目录
+            duration_param: 处理时长（秒），None 表示使用 Spleeter 默认值
+        """
         cmd = [
             'spleeter',
             'separate',
@@ -248,9 +784,11 @@ class AudioSeparator(VideoProcessor):
         if duration_param:
             cmd.extend(['-d', str(duration_param)])
         
-        cmd.append(str(audio_path))
+        cmd.extend(str(audio_path) for audio_path in audio_paths)
         
-        self.logger.logger.info(f"执行 Spleeter 命令: {' '.join(cmd)}")
+        # 批量分离时命令行包含所有文件的绝对路径，只在确实输出 INFO 时才拼接
+        if self.logger.logger.isEnabledFor(logging.INFO):
+            self.logger.logger.info("执行 Spleeter 命令: %s", ' '.join(cmd))
         
         try:
             result = subprocess.run(
@@ -259,6 +797,7 @@ class AudioSeparator(VideoProcessor):
                 text=True,
                 encoding='utf-8',
                 errors='replace',
+                env=_spleeter_env(self.segment_workers),
                 timeout=3600  # 60 分钟超时
             )
             
@@ -284,40 +823,220 @@ class AudioSeparator(VideoProcessor):
             if isinstance(e, AudioSeparationError):
                 raise
             raise AudioSeparationError(f"Spleeter 执行错误: {str(e)}")
+    
+    def _batch_separate(
+        self,
+        audio_paths: List[Path],
+        output_dir: Path,
+        duration: float
+    ) -> Dict[Path, Path]:
+        """一次 spleeter 命令行调用分离多个音频
         
-        # Spleeter 输出结构：output_dir/audio_name/vocals.wav 和 accompaniment.wav
-        separated_dir = output_dir / audio_path.stem
-        vocal_path = separated_dir / 'vocals.wav'
-        background_path = separated_dir / 'accompaniment.wav'
+        各音频文件名（不含扩展名）必须互不相同，
+        Spleeter 按文件名在 output_dir 下创建各自的输出目录。
         
-        if not vocal_path.exists():
-            raise AudioSeparationError(f"未找到人声文件: {vocal_path}")
-        if not background_path.exists():
-            raise AudioSeparationError(f"未找到背景音乐文件: {background_path}")
+        Args:
+            audio_paths: 音频文件路径列表
+            output_dir: 输出目录
+            duration: 最长音频的时长（秒），用于设置 Spleeter 的 duration 参数
+            
+        Returns:
+            音频路径到人声（或混合了伴奏的）文件路径的映射；
+            未找到输出的音频不包含在内
+        """
+        self._run_spleeter_cli(audio_paths, output_dir, int(duration) + 1)
+        
+        separated = {}
+        for audio_path in audio_paths:
+            separated_dir = output_dir / audio_path.stem
+            vocal_path = separated_dir / 'vocals.wav'
+            background_path = separated_dir / 'accompaniment.wav'
+            if not vocal_path.exists():
+                continue
+            
+            if self.accompaniment_volume > 0:
+                if not background_path.exists():
+                    continue
+                mixed_path = separated_dir / "mixed.wav"
+                self._mix_audio(vocal_path, background_path, mixed_path, self.accompaniment_volume)
+                vocal_path = mixed_path
+            
+            separated[audio_path] = vocal_path
         
-        # 检查输出音频的时长
+        return separated
+    
+    def _preseparate_batch(self, drama_dirs: List[Path]) -> None:
+        """批量处理前，用一次 Spleeter 调用分离所有短音频
+        
+        只在使用命令行工具时执行：逐个目录提取音频后一次性交给 spleeter，
+        避免每个目录都启动一次进程并重新加载模型。结果记录在
+        self._preseparated 中，由 process 直接使用；长音频（需要分段）、
+        无法提取的目录以及批量分离失败时，仍由 process 逐个处理。
+        
+        Args:
+            drama_dirs: 短剧目录路径列表
+        """
+        work_dir = self._batch_tmp / "batch_separate"
+        work_dir.mkdir()
+        
+        audio_to_video: Dict[Path, Path] = {}
+        max_duration = 0.0
+        
+        for i, drama_dir in enumerate(drama_dirs):
+            input_video = _find_input_video(_list_files(drama_dir / "merged"))
+            if input_video is None:
+                continue
+            
+            try:
+                duration = self._get_duration(input_video)
+                if not 0 < duration <= LONG_AUDIO_THRESHOLD:
+                    continue
+                # 以序号命名，保证 Spleeter 的输出目录互不冲突
+                audio_path = self.extract_audio(input_video, work_dir / f"{i:04d}.wav")
+            except Exception as e:
+                self.logger.logger.warning(f"批量分离时无法提取音频 {input_video}: {e}")
+                continue
+            
+            audio_to_video[audio_path] = input_video
+            max_duration = max(max_duration, duration)
+        
+        if not audio_to_video:
+            return
+        
+        self.logger.logger.info(
+            f"一次调用 Spleeter 分离 {len(audio_to_video)} 个音频（模型: {self.model}）"
+        )
         try:
-            vocal_duration = self.ffmpeg.get_audio_duration(vocal_path)
-            input_duration = self.ffmpeg.get_audio_duration(audio_path)
+            separated = self._batch_separate(
+                list(audio_to_video), work_dir / "separated", max_duration
+            )
+        except Exception as e:
+            self.logger.logger.warning(f"批量分离失败: {e}，改为逐个处理")
+            return
+        
+        for audio_path, vocal_path in separated.items():
+            self._preseparated[audio_to_video[audio_path]] = vocal_path
+    
+    def _decode_to_array(self, source_path: Path, duration: float = 0.0):
+        """将视频或音频的音轨解码为内存中的波形数组
+        
+        FFmpeg 以 32 位浮点 PCM 输出到管道，直接读入预分配的缓冲区，
+        不经过临时 WAV 文件。
+        
+        Args:
+            source_path: 视频或音频文件路径
+            duration: 预估时长（秒），用于预分配缓冲区；为 0 时按需扩容
             
-            self.logger.logger.info(f"输入音频时长: {input_duration:.2f}秒, 输出人声时长: {vocal_duration:.2f}秒")
+        Returns:
+            形状为 (采样数, 2) 的 float32 numpy 数组
             
-            # 如果输出音频明显短于输入音频，发出警告
-            if vocal_duration < input_duration - 5.0:
-                self.logger.logger.error(
-                    f"Spleeter 输出音频比输入短 {input_duration - vocal_duration:.2f}秒！"
-                )
+        Raises:
+            FFmpegError: 当解码失败时
+        """
+        cmd = [
+            'ffmpeg', '-nostdin', '-v', 'error',
+            '-i', str(source_path),
+            '-vn',
+            '-f', 'f32le',
+            '-ar', str(_SAMPLE_RATE),
+            '-ac', str(_CHANNELS),
+            '-'
+        ]
+        
+        frame_bytes = 4 * _CHANNELS
+        # 多预留 1 秒，避免时长取整误差导致扩容
+        capacity = int((duration + 1) * _SAMPLE_RATE) * frame_bytes if duration > 0 else 1 << 24
+        buf = np.empty(capacity, dtype=np.uint8)
+        filled = 0
+        
+        try:
+            process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        except FileNotFoundError:
+            raise FFmpegError(
+                "未找到 FFmpeg 可执行文件。请确保 FFmpeg 已安装并在 PATH 中。"
+            )
+        
+        with process:
+            while True:
+                if filled == len(buf):
+                    buf = np.concatenate((buf, np.empty(len(buf), dtype=np.uint8)))
+                n = process.stdout.readinto(memoryview(buf)[filled:])
+                if not n:
+                    break
+                filled += n
+            stderr = process.stderr.read()
+            return_code = process.wait()
+        
+        if return_code != 0:
+            raise FFmpegError(
+                f"音频解码失败 (返回码: {return_code}): "
+                f"{stderr.decode('utf-8', errors='replace')}"
+            )
+        
+        filled -= filled % frame_bytes
+        return buf[:filled].view(np.float32).reshape(-1, _CHANNELS)
+    
+    @staticmethod
+    def _write_wav(path: Path, waveform) -> None:
+        """将 float32 波形写出为 16 位 PCM WAV 文件
+        
+        Args:
+            path: 输出文件路径
+            waveform: 形状为 (采样数, 声道数) 的 numpy 数组，取值范围 [-1, 1]
+        """
+        pcm = (np.clip(waveform, -1.0, 1.0) * 32767).astype('<i2')
+        with wave.open(str(path), 'wb') as f:
+            f.setnchannels(pcm.shape[1])
+            f.setsampwidth(2)
+            f.setframerate(_SAMPLE_RATE)
+            f.writeframes(pcm.tobytes())
+    
+    def _separate_in_memory(
+        self,
+        source_path: Path,
+        output_dir: Path,
+        duration: float = 0.0
+    ) -> Path:
+        """在内存中完成解码和分离，只写出最终的人声音轨
+        
+        需要 Spleeter Python API 可用。整段音频保存在内存中，
+        只适用于不需要分段处理的音频。音频按模型的 44.1kHz 双声道解码和
+        写出，因此语音模式下不使用（见 process）。
+        
+        Args:
+            source_path: 视频或音频文件路径
+            output_dir: 输出目录
+            duration: 预估时长（秒）
+            
+        Returns:
+            人声（或混合了伴奏的）WAV 文件路径
+        """
+        waveform = self._decode_to_array(source_path, duration)
+        
+        try:
+            with self._separator_lock:
+                prediction = self._spleeter.separate(waveform)
         except Exception as e:
-            self.logger.logger.warning(f"无法验证输出音频时长: {e}")
+            raise AudioSeparationError(f"Spleeter 执行错误: {str(e)}")
         
-        # 如果需要混合伴奏，创建混合音频
+        vocals = prediction['vocals']
+        
+        # 如果需要混合伴奏，直接在内存中按比例叠加，增益与 _mix_audio 相同
+        # （4stems/5stems 模型没有 accompaniment，使用其余音轨之和）
         if self.accompaniment_volume > 0:
             self.logger.logger.info(f"混合人声和伴奏（伴奏音量: {self.accompaniment_volume*100:.0f}%）")
-            mixed_path = output_dir / "mixed.wav"
-            self._mix_audio(vocal_path, background_path, mixed_path, self.accompaniment_volume)
-            return mixed_path, background_path
+            if 'accompaniment' in prediction:
+                background = prediction['accompaniment']
+            else:
+                background = sum(v for k, v in prediction.items() if k != 'vocals')
+            vocals = _mix_tracks(np.array(vocals, dtype='float32'), background, self.accompaniment_volume)
+            vocal_path = output_dir / "mixed.wav"
+        else:
+            vocal_path = output_dir / "vocals.wav"
         
-        return vocal_path, background_path
+        self._write_wav(vocal_path, vocals)
+        
+        return vocal_path
     
     def _separate_long_audio(
         self,
@@ -327,11 +1046,17 @@ class AudioSeparator(VideoProcessor):
     ) -> Tuple[Path, Path]:
         """分段处理长音频
         
-        将长音频分成多个片段，分别用 Spleeter 处理，然后合并结果。
+        将长音频分成多个片段，分别用 Spleeter 处理（最多 segment_workers
+        段同时处理），然后合并结果。
         每段8分钟，避免内存占用过大。
         
+        安装了 numpy 和 soundfile 时，相邻片段重叠 SEGMENT_OVERLAP_SECONDS 秒，
+        合并时对重叠部分做线性交叉淡化，消除硬切分在拼接处产生的咔哒声；
+        否则按固定时长硬切分，只写出 ffconcat 片段列表。
+        
         Args:
-            audio_path: 音频文件路径
+            audio_path: 音频文件路径，也可以直接是视频文件
+                       （片段直接从源文件切出）
             output_dir: 输出目录
             duration: 音频总时长（秒）
             
@@ -339,57 +1064,93 @@ class AudioSeparator(VideoProcessor):
             (vocal_path, background_path)
         """
         # 每段处理8分钟（480秒）
-        segment_duration = 480
+        segment_duration = SEGMENT_SECONDS
+        overlap = SEGMENT_OVERLAP_SECONDS if np is not None and sf is not None else 0
         
         segments_dir = output_dir / "segments"
-        segments_dir.mkdir(exist_ok=True)
-        
-        vocal_segments = []
-        background_segments = []
-        
-        # 计算需要分多少段
-        num_segments = int((duration + segment_duration - 1) / segment_duration)
+        if overlap:
+            # 第 i 段从 i * segment_duration 开始，多取 overlap 秒与下一段重叠；
+            # 最后一段超过重叠部分才需要单独成段
+            segments_dir.mkdir(parents=True, exist_ok=True)
+            segments = None
+            num_segments = max(1, math.ceil((duration - overlap) / segment_duration))
+        else:
+            segments = self.extract_audio_segments(audio_path, segments_dir, segment_duration)
+            num_segments = len(segments)
         self.logger.logger.info(f"将音频分为 {num_segments} 段处理")
         
-        for i in range(num_segments):
+        def separate_segment(i: int) -> Tuple[Path, Path]:
             start_time = i * segment_duration
+            last = i == num_segments - 1
             # 最后一段处理到结尾
-            if i == num_segments - 1:
-                segment_duration_actual = duration - start_time
-            else:
-                segment_duration_actual = segment_duration
+            end_time = duration if last else min(start_time + segment_duration + overlap, duration)
             
             self.logger.logger.info(
                 f"处理第 {i+1}/{num_segments} 段 "
-                f"(时间: {start_time:.1f}s - {start_time + segment_duration_actual:.1f}s)"
+                f"(时间: {start_time:.1f}s - {end_time:.1f}s)"
             )
             
-            # 提取音频片段
-            segment_path = segments_dir / f"segment_{i:03d}.wav"
-            self._extract_audio_segment(audio_path, segment_path, start_time, segment_duration_actual)
-            
-            # 分离该片段
             segment_output_dir = segments_dir / f"output_{i:03d}"
             segment_output_dir.mkdir(exist_ok=True)
             
+            if segments is None:
+                segment_path = segments_dir / f"segment_{i:03d}.wav"
+            else:
+                segment_path = segments[i]
+            
             try:
-                vocal_seg, bg_seg = self._separate_with_spleeter(segment_path, segment_output_dir)
-                
-                vocal_segments.append(vocal_seg)
-                background_segments.append(bg_seg)
+                if segments is None:
+                    self._extract_audio_window(
+                        audio_path,
+                        segment_path,
+                        start_time,
+                        None if last else segment_duration + overlap
+                    )
+                vocal, background = self._separate_with_spleeter(segment_path, segment_output_dir)
             finally:
                 # 删除原始片段以节省空间
                 if segment_path.exists():
                     segment_path.unlink()
+            
+            # 只把合并需要的两个文件移出，该段的其余中间结果（Spleeter 的
+            # 输出目录、混合前的人声等）立即删除，不必等整个音频处理完
+            staged = (
+                vocal.replace(segments_dir / f"vocals_{i:03d}{vocal.suffix}"),
+                background.replace(segments_dir / f"accompaniment_{i:03d}{background.suffix}")
+            )
+            shutil.rmtree(segment_output_dir, ignore_errors=True)
+            return staged
+        
+        # 各片段互相独立：使用命令行工具时 Spleeter 在子进程中运行，线程只
+        # 负责等待，因此用线程池即可让多个片段同时分离；map 保持片段顺序。
+        # 使用 Python API 时模型只有一份，各段依次分离，不必开线程池
+        workers = 1 if self._in_process else min(self.segment_workers, num_segments)
+        if workers <= 1:
+            separated = [separate_segment(i) for i in range(num_segments)]
+        else:
+            self.logger.logger.info(f"同时处理 {workers} 段")
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                separated = list(executor.map(separate_segment, range(num_segments)))
+        
+        vocal_segments = [vocal for vocal, _ in separated]
+        background_segments = [background for _, background in separated]
         
-        # 合并所有片段
         self.logger.logger.info("合并所有处理后的片段")
         
-        final_vocal = output_dir / "vocals.wav"
-        final_background = output_dir / "accompaniment.wav"
-        
-        self._concat_audio_segments(vocal_segments, final_vocal)
-        self._concat_audio_segments(background_segments, final_background)
+        if overlap:
+            final_vocal = output_dir / "vocals.wav"
+            final_background = output_dir / "accompaniment.wav"
+            
+            self._crossfade_concat(vocal_segments, final_vocal, overlap, remove_segments=True)
+            self._crossfade_concat(background_segments, final_background, overlap, remove_segments=True)
+        else:
+            # 只写出片段列表，不生成拼接后的完整 WAV，
+            # 后续的 FFmpeg 命令直接以列表为输入，边读取片段边处理
+            final_vocal = output_dir / "vocals.ffconcat"
+            final_background = output_dir / "accompaniment.ffconcat"
+            
+            self._write_concat_list(vocal_segments, final_vocal)
+            self._write_concat_list(background_segments, final_background)
         
         # 如果需要混合伴奏，创建混合音频
         if self.accompaniment_volume > 0:
@@ -400,71 +1161,112 @@ class AudioSeparator(VideoProcessor):
         
         return final_vocal, final_background
     
-    def _extract_audio_segment(
+    def _extract_audio_window(
         self,
-        input_path: Path,
+        source_path: Path,
         output_path: Path,
         start_time: float,
-        duration: float
+        length: Optional[float]
     ) -> None:
-        """提取音频片段
+        """从视频或音频中提取一段音频为 WAV
         
         Args:
-            input_path: 输入音频文件
-            output_path: 输出音频文件
-            start_time: 开始时间（秒）
-            duration: 持续时间（秒）
+            source_path: 视频或音频文件路径
+            output_path: 输出 WAV 文件路径
+            start_time: 起始时间（秒）
+            length: 时长（秒），为 None 时提取到结尾
+            
+        Raises:
+            FFmpegError: 当音频提取失败时
         """
-        command = FFmpegCommand(
-            inputs=[input_path],
+        options = ['-ss', f'{start_time:.3f}']
+        if length is not None:
+            options.extend(['-t', f'{length:.3f}'])
+        options.append('-vn')
+        options.extend(self._pcm_options())
+        options.append('-y')
+        
+        self.ffmpeg.execute(FFmpegCommand(
+            inputs=[source_path],
             output=output_path,
-            options=[
-                '-ss', str(start_time),
-                '-t', str(duration),
-                '-acodec', 'pcm_s16le',
-                '-ar', '44100',
-                '-ac', '2',
-                '-y'
-            ]
-        )
-        self.ffmpeg.execute(command)
+            options=options
+        ))
     
-    def _concat_audio_segments(
-        self,
+    @staticmethod
+    def _crossfade_concat(
         segments: List[Path],
-        output_path: Path
+        output_path: Path,
+        overlap_seconds: float,
+        remove_segments: bool = False
     ) -> None:
-        """合并音频片段
+        """拼接相互重叠的 WAV 片段，重叠部分做线性交叉淡化
+        
+        每个片段的末尾 overlap_seconds 秒与下一片段的开头是同一段音频。
+        逐段读取并写出，只保留上一段的重叠尾部，内存占用与片段时长成正比。
         
         Args:
-            segments: 音频片段路径列表
-            output_path: 输出文件路径
+            segments: 按时间顺序排列的片段路径列表
+            output_path: 输出 WAV 文件路径
+            overlap_seconds: 相邻片段的重叠时长（秒）
+            remove_segments: 是否在读取后立即删除片段，使拼接过程中
+                            磁盘上的片段与输出的总大小基本不变
         """
-        # 创建 concat 列表文件
-        concat_file = output_path.parent / f"{output_path.stem}_concat.txt"
+        info = sf.info(str(segments[0]))
+        overlap = int(overlap_seconds * info.samplerate)
+        fade_in = np.linspace(0.0, 1.0, overlap, dtype=np.float32)[:, None]
+        last_index = len(segments) - 1
+        
+        tail = None
+        with sf.SoundFile(
+            str(output_path), 'w',
+            samplerate=info.samplerate,
+            channels=info.channels,
+            subtype='PCM_16'
+        ) as out:
+            for index, segment in enumerate(segments):
+                data, _ = sf.read(str(segment), dtype='float32', always_2d=True)
+                if remove_segments:
+                    segment.unlink()
+                
+                if tail is not None:
+                    # 上一段的尾部淡出、本段的开头淡入
+                    n = min(len(tail), len(data))
+                    weights = fade_in if n == overlap else np.linspace(0.0, 1.0, n, dtype=np.float32)[:, None]
+                    head = data[:n]
+                    head *= weights
+                    head += tail[:n] * (1.0 - weights)
+                
+                if index < last_index and len(data) > overlap:
+                    out.write(data[:-overlap])
+                    tail = data[-overlap:].copy()
+                else:
+                    out.write(data)
+                    tail = None
+    
+    def _write_concat_list(
+        self,
+        segments: List[Path],
+        list_path: Path
+    ) -> None:
+        """写出音频片段的 ffconcat 列表
         
-        with open(concat_file, 'w', encoding='utf-8') as f:
-            for segment in segments:
-                f.write(f"file '{segment.absolute()}'\n")
+        以 "ffconcat version 1.0" 开头的文件会被 FFmpeg 自动识别为
+        concat 输入，可以像普通音频文件一样作为 -i 的输入，读取时按顺序
+        拼接各片段，省去一次完整 WAV 的写入和读取。
         
-        # 使用 FFmpeg concat
-        cmd = ['ffmpeg', '-f', 'concat', '-safe', '0', '-i', str(concat_file), '-c', 'copy', '-y', str(output_path)]
+        自动识别的 concat 输入默认启用 safe 模式，只接受相对路径，
+        因此片段路径写成相对于列表文件所在目录的路径。
         
-        try:
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                encoding='utf-8',
-                errors='replace'
-            )
-            
-            if result.returncode != 0:
-                raise FFmpegError(f"音频合并失败: {result.stderr}")
-        finally:
-            # 清理 concat 文件
-            if concat_file.exists():
-                concat_file.unlink()
+        Args:
+            segments: 音频片段路径列表（必须位于 list_path 所在目录之下）
+            list_path: 列表文件路径
+        """
+        base = list_path.parent
+        lines = ["ffconcat version 1.0\n"]
+        for segment in segments:
+            lines.append(f"file '{segment.relative_to(base).as_posix()}'\n")
+        
+        list_path.write_text(''.join(lines), encoding='utf-8')
     
     def _mix_audio(
         self,
@@ -475,8 +1277,10 @@ class AudioSeparator(VideoProcessor):
     ) -> None:
         """混合人声和伴奏音频
         
-        使用 FFmpeg 的 amix 滤镜将人声和伴奏混合，
-        可以控制伴奏的音量比例。
+        将伴奏按音量比例叠加到人声上，输出时长以人声为准。
+        安装了 numpy 和 soundfile 且两个输入都是不太大的 WAV 文件时直接在
+        内存中叠加，否则（例如输入是长音频或 ffconcat 片段列表）使用 FFmpeg
+        的 amix 滤镜。两种方式的增益相同（amix 默认的 1/2 归一化）。
         
         Args:
             vocal_path: 人声音频文件路径
@@ -484,26 +1288,88 @@ class AudioSeparator(VideoProcessor):
             output_path: 输出混合音频文件路径
             bg_volume: 伴奏音量（0.0-1.0）
         """
+        if (
+            np is not None and sf is not None
+            and vocal_path.suffix == '.wav' and background_path.suffix == '.wav'
+            and vocal_path.stat().st_size <= _IN_MEMORY_MIX_MAX_BYTES
+            and self._mix_wav_in_memory(vocal_path, background_path, output_path, bg_volume)
+        ):
+            return
+        
+        self._mix_audio_ffmpeg(vocal_path, background_path, output_path, bg_volume)
+    
+    def _mix_audio_ffmpeg(
+        self,
+        vocal_path: Path,
+        background_path: Path,
+        output_path: Path,
+        bg_volume: float
+    ) -> None:
+        """用 FFmpeg 的 amix 滤镜混合人声和伴奏
+        
+        输出格式与提取的中间 WAV 相同（见 _pcm_options），语音模式下保持
+        16kHz 单声道，不在最后一步重新升采样。
+        
+        Args:
+            vocal_path: 人声音频文件路径（也可以是 ffconcat 片段列表）
+            background_path: 伴奏音频文件路径
+            output_path: 输出混合音频文件路径
+            bg_volume: 伴奏音量（0.0-1.0）
+        """
         # 构建 FFmpeg 命令
         # 使用 amix 滤镜混合两个音频流
         # [0:a]volume=1.0[v] - 人声保持原音量
         # [1:a]volume={bg_volume}[b] - 伴奏调整音量
-        # [v][b]amix=inputs=2:duration=first - 混合两个音频，以第一个音频的时长为准
+        # [v][b]amix=inputs=2:duration=first - 混合两个音频（各除以 2），以第一个音频的时长为准
         command = FFmpegCommand(
             inputs=[vocal_path, background_path],
             output=output_path,
             options=[
                 '-filter_complex',
-                f'[0:a]volume=1.0[v];[1:a]volume={bg_volume}[b];[v][b]amix=inputs=2:duration=first',
-                '-acodec', 'pcm_s16le',
-                '-ar', '44100',
-                '-ac', '2',
+                _MIX_FILTER.format(bg_volume=bg_volume),
+                *self._pcm_options(),
                 '-y'
             ]
         )
         
         self.ffmpeg.execute(command)
     
+    def _mix_wav_in_memory(
+        self,
+        vocal_path: Path,
+        background_path: Path,
+        output_path: Path,
+        bg_volume: float
+    ) -> bool:
+        """用 numpy 叠加两个 WAV 文件
+        
+        只在人声已是输出格式（_pcm_options 的采样率和声道数）时混合，
+        不在内存中做重采样或缩混，保证与 FFmpeg 混合的输出格式相同。
+        
+        Args:
+            vocal_path: 人声 WAV 文件路径
+            background_path: 伴奏 WAV 文件路径
+            output_path: 输出 WAV 文件路径
+            bg_volume: 伴奏音量（0.0-1.0）
+            
+        Returns:
+            是否已完成混合；采样率或声道数与输出格式或彼此不一致时返回 False，
+            由调用方回退到 FFmpeg
+        """
+        info = sf.info(str(vocal_path))
+        if info.samplerate != self._extract_rate or info.channels != self._extract_channels:
+            return False
+        
+        vocal, sample_rate = sf.read(str(vocal_path), dtype='float32', always_2d=True)
+        background, bg_rate = sf.read(str(background_path), dtype='float32', always_2d=True)
+        if bg_rate != sample_rate or background.shape[1] != vocal.shape[1]:
+            return False
+        
+        _mix_tracks(vocal, background, bg_volume)
+        
+        sf.write(str(output_path), vocal, sample_rate, subtype='PCM_16')
+        return True
+    
     def replace_audio(
         self, 
         video_path: Path, 
@@ -518,7 +1384,7 @@ class AudioSeparator(VideoProcessor):
         
         Args:
             video_path: 原视频文件路径
-            audio_path: 新音频文件路径
+            audio_path: 新音频文件路径（也可以是 ffconcat 片段列表）
             output_path: 输出视频文件路径
             
         Raises:
@@ -532,23 +1398,31 @@ class AudioSeparator(VideoProcessor):
         # 确保输出目录存在
         output_path.parent.mkdir(parents=True, exist_ok=True)
         
-        # 获取视频和音频的时长
+        # 获取视频时长（用于进度显示；process 中已探测过同一文件，直接命中缓存）
         try:
-            video_duration = self.ffmpeg.get_video_duration(video_path)
-            audio_duration = self.ffmpeg.get_audio_duration(audio_path)
-            
-            self.logger.logger.info(f"视频时长: {video_duration:.2f}秒, 音频时长: {audio_duration:.2f}秒")
-            
-            # 如果音频比视频短超过1秒，发出警告
-            if audio_duration < video_duration - 1.0:
-                self.logger.logger.warning(
-                    f"音频比视频短 {video_duration - audio_duration:.2f}秒，"
-                    f"将用静音填充"
-                )
+            video_duration = self._get_duration(video_path)
         except Exception as e:
             self.logger.logger.warning(f"无法获取时长信息: {e}，继续处理")
             video_duration = None
         
+        # 音频时长只用于日志，长度不一致由 apad + -shortest 处理，
+        # 因此只在调试级别下额外探测。
+        # 音频可能是 ffconcat 片段列表，其时长未必能探测到，失败时只跳过检查
+        if video_duration is not None and self.logger.logger.isEnabledFor(logging.DEBUG):
+            try:
+                audio_duration = self._get_duration(audio_path)
+                
+                self.logger.logger.info(f"视频时长: {video_duration:.2f}秒, 音频时长: {audio_duration:.2f}秒")
+                
+                # 如果音频比视频短超过1秒，发出警告
+                if audio_duration < video_duration - 1.0:
+                    self.logger.logger.warning(
+                        f"音频比视频短 {video_duration - audio_duration:.2f}秒，"
+                        f"将用静音填充"
+                    )
+            except Exception as e:
+                self.logger.logger.warning(f"无法获取音频时长: {e}，继续处理")
+        
         self.logger.logger.info("正在替换音频轨道，这可能需要几分钟...")
         
         # 构建 FFmpeg 命令：替换音频轨道
@@ -559,6 +1433,8 @@ class AudioSeparator(VideoProcessor):
                 '-map', '0:v',   # 使用第一个输入的视频流
                 '-map', '1:a',   # 使用第二个输入的音频流
                 '-c:v', 'copy',  # 直接复制视频流（不重新编码，保持原始质量）
+                '-af', 'apad',   # 音频较短时用静音补齐
+                '-shortest',     # 以视频时长为准截断（补齐后的音频无限长）
                 '-c:a', 'aac',   # 音频编码为 AAC
                 '-b:a', '192k',  # 音频比特率 192kbps
                 '-y'             # 覆盖输出文件
@@ -574,10 +1450,62 @@ class AudioSeparator(VideoProcessor):
                 self.logger.logger.info(f"音频替换进度: {percentage:.1f}%")
                 last_reported[0] = current
         
-        self.ffmpeg.execute(command, progress_callback=on_progress if video_duration else None)
+        self.ffmpeg.execute(
+            command,
+            progress_callback=on_progress if video_duration else None,
+            total_duration=video_duration
+        )
         
         self.logger.logger.info("音频替换完成")
     
+    @contextmanager
+    def _job_tempdir(self, drama_dir: Path) -> Iterator[Path]:
+        """为单个目录的处理提供临时目录
+        
+        批量处理期间在批次临时目录下创建子目录，处理完成后删除；
+        单独调用 process 时使用独立的临时目录。
+        
+        Args:
+            drama_dir: 短剧目录路径
+            
+        Yields:
+            临时目录路径
+        """
+        if self._batch_tmp is None:
+            with tempfile.TemporaryDirectory() as temp_dir:
+                yield Path(temp_dir)
+            return
+        
+        job_tmp = Path(tempfile.mkdtemp(prefix=f"{drama_dir.name}_", dir=self._batch_tmp))
+        try:
+            yield job_tmp
+        finally:
+            shutil.rmtree(job_tmp, ignore_errors=True)
+    
+    def close(self) -> None:
+        """释放 Spleeter 分离器及其 TensorFlow 会话
+        
+        批量处理结束后调用，避免连续批次之间内存持续增长；
+        下一次处理时会重新创建分离器。
+        """
+        if self._audio_separator is not None:
+            self._audio_separator = None
+            self._separator_checked = False
+            shutil.rmtree(self._audio_separator_dir, ignore_errors=True)
+            self._audio_separator_dir = None
+            return
+        
+        if self._spleeter is None:
+            return
+        
+        self._spleeter = None
+        self._separator_checked = False
+        try:
+            import tensorflow as tf
+            tf.keras.backend.clear_session()
+        except Exception:
+            pass
+    
     def process(
         self, 
         drama_dir: Path, 
@@ -632,8 +1560,11 @@ class AudioSeparator(VideoProcessor):
                 return result
             
             # 2. 查找视频文件
-            video_files = list(merged_dir.glob("*.mp4"))
-            if not video_files:
+            # 一次列出目录，视频和字幕都从同一份列表中查找
+            merged_files = _list_files(merged_dir)
+            # 使用第一个视频文件（通常是 merged.mp4）
+            input_video = _find_input_video(merged_files)
+            if input_video is None:
                 error_msg = f"merged/ 目录中没有视频文件: {merged_dir}"
                 self.logger.log_validation_error(drama_dir, error_msg)
                 result = ProcessingResult(
@@ -647,9 +1578,6 @@ class AudioSeparator(VideoProcessor):
                     progress_callback.on_file_complete(result)
                 return result
             
-            # 使用第一个视频文件（通常是 merged.mp4）
-            input_video = video_files[0]
-            
             # 3. 创建 cleared/ 目录
             cleared_dir = drama_dir / "cleared"
             self.file_manager.ensure_directory(cleared_dir)
@@ -658,21 +1586,52 @@ class AudioSeparator(VideoProcessor):
             output_video = self.file_manager.get_unique_path(cleared_dir / input_video.name)
             
             # 5. 创建临时目录用于中间文件
-            with tempfile.TemporaryDirectory() as temp_dir:
-                temp_path = Path(temp_dir)
-                
-                # 6. 提取音频
-                self.logger.logger.info(f"提取音频: {input_video.name}")
-                audio_path = self.extract_audio(input_video)
+            with self._job_tempdir(drama_dir) as temp_path:
                 
-                # 将音频移到临时目录
-                temp_audio = temp_path / audio_path.name
-                shutil.move(str(audio_path), str(temp_audio))
-                audio_path = temp_audio
+                try:
+                    video_duration = self._get_duration(input_video)
+                except Exception as e:
+                    self.logger.logger.warning(f"无法获取音频时长: {e}，使用默认处理方式")
+                    video_duration = 0
                 
-                # 7. 分离人声和背景音乐
-                self.logger.logger.info(f"分离人声和背景音乐（模型: {self.model}）")
-                vocal_path, _ = self.separate_vocals(audio_path)
+                if video_duration > LONG_AUDIO_THRESHOLD:
+                    # 6-7. 长音频：直接从视频切分出 WAV 片段并逐段分离，
+                    # 不再先写出完整的 WAV
+                    self.logger.logger.info(
+                        f"音频较长（{video_duration:.0f}秒），将分段处理以降低内存占用"
+                    )
+                    self.logger.logger.info(f"分离人声和背景音乐（模型: {self.model}）")
+                    output_dir = temp_path / f"{input_video.stem}_separated"
+                    output_dir.mkdir()
+                    vocal_path, _ = self._separate_long_audio(
+                        input_video, output_dir, video_duration
+                    )
+                elif self._spleeter is not None and not self.speech_mode:
+                    # 6-7. Python API 可用时直接把解码出的音频交给模型，
+                    # 不写出中间 WAV，只写出最终的人声音轨；
+                    # 语音模式走下面提取 16kHz 单声道 WAV 的路径，输出格式与
+                    # FFmpeg 混合一致
+                    self.logger.logger.info(f"分离人声和背景音乐（模型: {self.model}）")
+                    vocal_path = self._separate_in_memory(
+                        input_video, temp_path, video_duration
+                    )
+                elif input_video in self._preseparated:
+                    # 6-7. 已在批量处理开始时与其他目录一起分离
+                    self.logger.logger.info(f"使用批量分离的结果: {input_video.name}")
+                    vocal_path = self._preseparated[input_video]
+                else:
+                    # 6. 提取音频
+                    self.logger.logger.info(f"提取音频: {input_video.name}")
+                    audio_path = self.extract_audio(input_video)
+                    
+                    # 将音频移到临时目录
+                    temp_audio = temp_path / audio_path.name
+                    shutil.move(str(audio_path), str(temp_audio))
+                    audio_path = temp_audio
+                    
+                    # 7. 分离人声和背景音乐
+                    self.logger.logger.info(f"分离人声和背景音乐（模型: {self.model}）")
+                    vocal_path, _ = self.separate_vocals(audio_path)
                 
                 # 8. 替换音频轨道
                 self.logger.logger.info(f"替换音频轨道: {output_video.name}")
@@ -680,8 +1639,8 @@ class AudioSeparator(VideoProcessor):
             
             # 9. 复制字幕文件（如果存在）- 使用唯一路径避免覆盖
             for subtitle_ext in ['.srt', '.ass']:
-                subtitle_file = merged_dir / f"{input_video.stem}{subtitle_ext}"
-                if subtitle_file.exists():
+                subtitle_file = merged_files.get(f"{input_video.stem}{subtitle_ext}")
+                if subtitle_file is not None:
                     output_subtitle = self.file_manager.get_unique_path(
                         cleared_dir / subtitle_file.name
                     )
@@ -729,7 +1688,8 @@ class AudioSeparator(VideoProcessor):
     ) -> List[ProcessingResult]:
         """批量处理多个短剧目录
         
-        依次处理每个短剧目录，即使某些目录处理失败，
+        最多 batch_workers 个目录同时处理，使一个目录的 FFmpeg 步骤
+        与另一个目录的 Spleeter 分离重叠执行。即使某些目录处理失败，
         也会继续处理剩余的目录。
         
         Args:
@@ -739,22 +1699,66 @@ class AudioSeparator(VideoProcessor):
         Returns:
             处理结果列表，与输入目录一一对应
         """
-        results = []
         total = len(drama_dirs)
+        workers = min(_limit_by_memory(self.batch_workers, _DRAMA_MEMORY_GB), total)
         
-        for i, drama_dir in enumerate(drama_dirs, 1):
-            # 更新进度
-            if progress_callback:
-                progress_callback.on_progress(ProgressInfo(
-                    current=i,
-                    total=total,
-                    current_file=str(drama_dir),
-                    percentage=(i / total) * 100
-                ))
-            
-            # 处理单个目录
-            result = self.process(drama_dir, progress_callback)
-            results.append(result)
+        # 整个批次共用一个临时目录，各目录在其下创建自己的子目录，
+        # 批次结束时统一删除
+        self._batch_tmp = Path(tempfile.mkdtemp(prefix='drama_sep_'))
+        try:
+            # 在处理各目录（及启动工作线程）前检查一次分离工具
+            if not self._separator_checked:
+                self._check_separator_available()
+                self._separator_checked = True
+            
+            # 使用命令行工具时，先用一次 spleeter 调用分离所有短音频
+            if not self._in_process and total > 1:
+                self._preseparate_batch(drama_dirs)
+            
+            if workers <= 1:
+                results = []
+                for i, drama_dir in enumerate(drama_dirs, 1):
+                    # 更新进度
+                    if progress_callback:
+                        progress_callback.on_progress(ProgressInfo(
+                            current=i,
+                            total=total,
+                            current_file=str(drama_dir),
+                            percentage=(i / total) * 100
+                        ))
+                    
+                    # 处理单个目录
+                    result = self.process(drama_dir, progress_callback)
+                    results.append(result)
+            else:
+                callback = LockedProgressCallback(progress_callback) if progress_callback else None
+                started = [0]  # 使用列表以便在闭包中修改
+                started_lock = threading.Lock()
+                
+                def process_single(drama_dir: Path) -> ProcessingResult:
+                    if callback:
+                        with started_lock:
+                            started[0] += 1
+                            current = started[0]
+                        callback.on_progress(ProgressInfo(
+                            current=current,
+                            total=total,
+                            current_file=str(drama_dir),
+                            percentage=(current / total) * 100
+                        ))
+                    return self.process(drama_dir, callback)
+                
+                # 实际工作在 Spleeter/FFmpeg 子进程中进行，线程只负责调度；
+                # process 内部捕获所有异常，map 按输入顺序返回结果
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    results = list(executor.map(process_single, drama_dirs))
+        finally:
+            self._preseparated.clear()
+            shutil.rmtree(self._batch_tmp, ignore_errors=True)
+            self._batch_tmp = None
+        
+        # 批次结束后释放模型
+        self.close()
         
         # 记录批量处理摘要
         success_count = sum(1 for r in results if r.status == ProcessingStatus.COMPLETED)
@@ -7,10 +7,40 @@
 """
 
 import re
+from collections import Counter
+from functools import lru_cache
 from pathlib import Path
 from typing import List, Tuple, Optional, Union
 
 
+# 预编译的正则表达式，避免每次调用时查找模式缓存
+_NUM_RE = re.compile(r'\d+')
+_SPLIT_RE = re.compile(r'(\d+)')
+
+
+@lru_cache(maxsize=4096)
+def _natural_key(name: str) -> Tuple[Union[int, str], ...]:
+    """计算已转小写的文件名（不含扩展名）的自然排序键
+    
+    同一批文件在各处理阶段会被反复排序，按字符串缓存结果，
+    相同文件名只需分割一次。
+    
+    Args:
+        name: 已转小写的文件名（不含扩展名）
+    
+    Returns:
+        排序键元组，包含交替的文本和数字部分
+    """
+    # 带捕获组的 split 一次得到交替的文本和数字部分：
+    # 奇数下标为数字，偶数下标为文本（可能为空串）
+    parts = _SPLIT_RE.split(name)
+    return tuple(
+        int(part) if i & 1 else part
+        for i, part in enumerate(parts)
+        if part
+    ) or ('',)
+
+
 class FileSorter:
     """文件排序器
     
@@ -43,7 +73,7 @@ class FileSorter:
         # 移除扩展名，只处理文件名主体
         stem = Path(filename).stem if '.' in filename else filename
         # 提取所有数字序列
-        numbers = re.findall(r'\d+', stem)
+        numbers = _NUM_RE.findall(stem)
         # 转换为整数元组
         return tuple(int(n) for n in numbers) if numbers else (0,)
     
@@ -73,17 +103,8 @@ class FileSorter:
             >>> FileSorter.natural_sort_key(Path("video-10.mp4"))
             ('video-', 10)
         """
-        filename = path.stem  # 不含扩展名的文件名
-        
-        # 分割文件名为文本和数字部分
-        parts: List[Union[int, str]] = []
-        for match in re.finditer(r'(\d+)|(\D+)', filename):
-            if match.group(1):  # 数字部分
-                parts.append(int(match.group(1)))
-            else:  # 文本部分
-                parts.append(match.group(2).lower())  # 转小写以实现大小写不敏感排序
-        
-        return tuple(parts) if parts else ('',)
+        # 整体转小写以实现大小写不敏感排序（数字不受影响）
+        return _natural_key(path.stem.lower())
     
     @classmethod
     def sort_files(cls, files: List[Path]) -> List[Path]:
@@ -136,33 +157,19 @@ class FileSorter:
             return False, "文件列表为空"
         
         # 提取每个文件的第一个数字（主序号）
-        numbers = []
-        for f in files:
-            extracted = cls.extract_number(f.name)
-            # 使用第一个数字作为主序号
-            numbers.append(extracted[0])
-        
-        # 检查是否有重复
-        seen = set()
-        duplicates = []
-        for n in numbers:
-            if n in seen:
-                if n not in duplicates:
-                    duplicates.append(n)
-            else:
-                seen.add(n)
+        numbers = [cls.extract_number(f.name)[0] for f in files]
         
-        if duplicates:
+        # 检查是否有重复（一次计数，无重复时不需要排序）
+        counts = Counter(numbers)
+        if len(counts) != len(numbers):
+            duplicates = [n for n, c in counts.items() if c > 1]
             return False, f"发现重复的序号: {sorted(duplicates)}"
         
-        # 检查是否连续（允许从任意数字开始）
-        sorted_numbers = sorted(numbers)
-        start = sorted_numbers[0]
-        expected = list(range(start, start + len(sorted_numbers)))
-        
-        if sorted_numbers != expected:
-            missing = set(expected) - set(sorted_numbers)
-            if missing:
-                return False, f"序列不连续，缺失序号: {sorted(missing)}"
+        # 检查是否连续（允许从任意数字开始）：
+        # 没有重复时，当且仅当 max - min + 1 == 个数 时序号连续
+        start = min(numbers)
+        if max(numbers) - start + 1 != len(numbers):
+            missing = set(range(start, start + len(numbers))).difference(counts)
+            return False, f"序列不连续，缺失序号: {sorted(missing)}"
         
         return True, None
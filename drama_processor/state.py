@@ -5,18 +5,35 @@
 """
 
 import json
+import os
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional
 
-from .models import ProcessingStatus
+from .models import DATACLASS_SLOTS, ProcessingStatus
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
-@dataclass
+# 追加日志的记录数超过实际状态数的该倍数时压缩为快照
+_COMPACT_RATIO = 10
+
+# 未安装 orjson 时使用的编码器：json.dumps 在传入非默认参数时每次都会
+# 新建 JSONEncoder，这里各配置只创建一次
+_SNAPSHOT_ENCODER = json.JSONEncoder(indent=2, ensure_ascii=False)
+_RECORD_ENCODER = json.JSONEncoder(ensure_ascii=False)
+
+
+@dataclass(frozen=True, **DATACLASS_SLOTS)
 class ProcessingState:
     """处理状态记录
     
+    记录创建后不再修改（状态变化时整体替换），因此声明为不可变；
+    加载大量记录时 slots 也省去了每个实例的 __dict__。
+    
     Attributes:
         drama_dir: 短剧目录路径
         operation: 操作类型 ("merge", "separate", "transcode")
@@ -24,6 +41,8 @@ class ProcessingState:
         timestamp: 时间戳
         output_files: 输出文件列表
         error_message: 错误信息（如果失败）
+        output_mtimes: 标记完成时各输出文件的修改时间（与 output_files 一一对应，
+            文件当时不存在则为 None）；旧状态文件中没有该字段时为 None
     """
     drama_dir: str
     operation: str
@@ -31,69 +50,211 @@ class ProcessingState:
     timestamp: str
     output_files: List[str]
     error_message: Optional[str] = None
+    output_mtimes: Optional[List[Optional[float]]] = None
+
+
+def _stat_mtime(path: str) -> Optional[float]:
+    """返回文件的修改时间，文件不存在或无法访问时返回 None"""
+    try:
+        return os.stat(path).st_mtime
+    except OSError:
+        return None
+
+
+def _loads(raw: bytes):
+    """解析 JSON 字节串（安装了 orjson 时使用 orjson）
+    
+    orjson.JSONDecodeError 是 json.JSONDecodeError 的子类，调用方统一捕获后者。
+    """
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
+
+
+def _state_to_dict(state: ProcessingState) -> Dict:
+    """把状态记录转换为可序列化的字典"""
+    return {
+        'drama_dir': state.drama_dir,
+        'operation': state.operation,
+        'status': state.status.value,
+        'timestamp': state.timestamp,
+        'output_files': state.output_files,
+        'error_message': state.error_message,
+        'output_mtimes': state.output_mtimes
+    }
+
+
+def _state_from_dict(state_dict: Dict) -> ProcessingState:
+    """从字典还原状态记录
+    
+    Raises:
+        KeyError: 缺少必需字段时
+        ValueError: 状态值无效时
+    """
+    return ProcessingState(
+        drama_dir=state_dict['drama_dir'],
+        operation=state_dict['operation'],
+        status=ProcessingStatus(state_dict['status']),
+        timestamp=state_dict['timestamp'],
+        output_files=state_dict['output_files'],
+        error_message=state_dict.get('error_message'),
+        output_mtimes=state_dict.get('output_mtimes')
+    )
 
 
 class StateManager:
     """状态管理器
     
     管理处理状态的持久化，支持断点续传。
+    
+    状态由两部分组成：完整快照（state_file，JSON）和追加日志
+    （state_file + ".jsonl"，每行一条状态变更）。mark_completed /
+    mark_failed 只向日志追加一行，加载时在快照之上按顺序重放日志，
+    同一任务以最后一条为准；日志远大于实际状态数时自动压缩为新的快照。
+    
+    日志写入经过缓冲，累计 flush_every 次更新后才落盘；调用 flush()
+    或退出 with 块时写出剩余更新：
+    
+        with StateManager(state_file) as state_manager:
+            state_manager.mark_completed(drama_dir, "merge", outputs)
     """
     
-    def __init__(self, state_file: Path):
+    def __init__(self, state_file: Path, flush_every: int = 16):
         """初始化状态管理器
         
         Args:
             state_file: 状态文件路径
+            flush_every: 累计多少次状态更新后自动写入文件（默认 16）；
+                        设为 1 则每次更新都立即写入
         """
         self.state_file = state_file
+        self.journal_file = state_file.with_name(state_file.name + '.jsonl')
+        self.flush_every = max(1, flush_every)
         self.states: Dict[str, ProcessingState] = {}
+        # 尚未写入文件的状态更新数
+        self._pending = 0
+        # 追加日志的文件句柄（首次追加时打开）及其中的记录数
+        self._journal = None
+        self._journal_records = 0
+        # 日志最后一行不完整（写入中途中断）时，追加前需要先补一个换行
+        self._journal_torn = False
+        # get_pending_tasks 期间缓存的目录列表：目录路径 -> {文件名: 目录项}
+        self._dir_listings: Optional[Dict[str, Dict[str, os.DirEntry]]] = None
         self.load_state()
     
+    def __enter__(self) -> "StateManager":
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+    
     def load_state(self) -> None:
-        """加载状态文件"""
-        if not self.state_file.exists():
-            self.states = {}
+        """加载状态文件（快照 + 追加日志）"""
+        self.states = {}
+        self._journal_records = 0
+        self._journal_torn = False
+        
+        if self.state_file.exists():
+            try:
+                data = _loads(self.state_file.read_bytes())
+                
+                # 转换为 ProcessingState 对象
+                for key, state_dict in data.items():
+                    self.states[key] = _state_from_dict(state_dict)
+            except (json.JSONDecodeError, KeyError, ValueError) as e:
+                # 状态文件损坏,重新开始
+                self.states = {}
+        
+        if self.journal_file.exists():
+            with open(self.journal_file, 'rb') as f:
+                for line in f:
+                    self._journal_torn = not line.endswith(b'\n')
+                    try:
+                        record = _loads(line)
+                        self.states[record['key']] = _state_from_dict(record)
+                    except (json.JSONDecodeError, KeyError, ValueError):
+                        # 写入中途中断的最后一行等损坏记录直接跳过
+                        continue
+                    self._journal_records += 1
+    
+    def flush(self) -> None:
+        """把缓冲中的状态更新写入日志文件（没有更新时不做任何事）"""
+        if not self._pending:
             return
         
-        try:
-            with open(self.state_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            
-            # 转换为 ProcessingState 对象
-            self.states = {}
-            for key, state_dict in data.items():
-                self.states[key] = ProcessingState(
-                    drama_dir=state_dict['drama_dir'],
-                    operation=state_dict['operation'],
-                    status=ProcessingStatus(state_dict['status']),
-                    timestamp=state_dict['timestamp'],
-                    output_files=state_dict['output_files'],
-                    error_message=state_dict.get('error_message')
-                )
-        except (json.JSONDecodeError, KeyError, ValueError) as e:
-            # 状态文件损坏,重新开始
-            self.states = {}
+        self._journal.flush()
+        self._pending = 0
+        
+        # 日志中大部分是同一任务的旧记录时压缩为快照
+        if self._journal_records > _COMPACT_RATIO * max(len(self.states), self.flush_every):
+            self.compact()
+    
+    def close(self) -> None:
+        """写出剩余更新并关闭日志文件"""
+        self.flush()
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+    
+    def _append(self, key: str) -> None:
+        """向追加日志写入一条状态记录，累计达到 flush_every 次时落盘
+        
+        Args:
+            key: 状态键
+        """
+        if self._journal is None:
+            self.journal_file.parent.mkdir(parents=True, exist_ok=True)
+            self._journal = open(self.journal_file, 'ab')
+            if self._journal_torn:
+                self._journal.write(b'\n')
+                self._journal_torn = False
+        
+        record = {'key': key, **_state_to_dict(self.states[key])}
+        if orjson is not None:
+            self._journal.write(orjson.dumps(record) + b'\n')
+        else:
+            self._journal.write(_RECORD_ENCODER.encode(record).encode('utf-8') + b'\n')
+        self._journal_records += 1
+        
+        self._pending += 1
+        if self._pending >= self.flush_every:
+            self.flush()
+    
+    def compact(self) -> None:
+        """把当前状态写成完整快照并清空追加日志"""
+        self.save_state()
     
     def save_state(self) -> None:
-        """保存状态文件"""
+        """保存完整的状态快照，之前的追加日志随之清空"""
         # 确保父目录存在
         self.state_file.parent.mkdir(parents=True, exist_ok=True)
         
         # 转换为可序列化的字典
-        data = {}
-        for key, state in self.states.items():
-            data[key] = {
-                'drama_dir': state.drama_dir,
-                'operation': state.operation,
-                'status': state.status.value,
-                'timestamp': state.timestamp,
-                'output_files': state.output_files,
-                'error_message': state.error_message
-            }
-        
-        # 写入文件
-        with open(self.state_file, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        data = {key: _state_to_dict(state) for key, state in self.states.items()}
+        
+        # 序列化：安装了 orjson 时直接得到 UTF-8 字节
+        if orjson is not None:
+            payload = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+        else:
+            payload = _SNAPSHOT_ENCODER.encode(data).encode('utf-8')
+        
+        # 先写入同目录下的临时文件再原子替换，写入中途崩溃时
+        # 原状态文件保持完整，不会留下截断的 JSON
+        tmp_file = self.state_file.with_name(self.state_file.name + '.tmp')
+        with open(tmp_file, 'wb') as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, self.state_file)
+        
+        # 快照已包含日志中的所有记录；在替换之后才删除日志，
+        # 两步之间中断时重放旧日志也只会得到相同的状态
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+        if self.journal_file.exists():
+            self.journal_file.unlink()
+        self._journal_records = 0
+        self._journal_torn = False
+        self._pending = 0
     
     def get_state_key(self, drama_dir: Path, operation: str) -> str:
         """生成状态键
@@ -128,13 +289,78 @@ class StateManager:
         if state.status != ProcessingStatus.COMPLETED:
             return False
         
-        # 验证输出文件是否存在
-        for output_file in state.output_files:
-            if not Path(output_file).exists():
+        # 旧状态没有记录修改时间，只验证输出文件是否存在
+        if state.output_mtimes is None:
+            for output_file in state.output_files:
+                if not self._output_exists(output_file):
+                    return False
+            return True
+        
+        # 输出文件须存在且自标记完成后未被改写（例如中断的重跑写了一半），
+        # 一次 stat 同时完成两项检查
+        for output_file, recorded in zip(state.output_files, state.output_mtimes):
+            mtime = self._output_mtime(output_file)
+            if mtime is None:
+                return False
+            if recorded is not None and mtime != recorded:
                 return False
         
         return True
     
+    def _listing(self, parent: str) -> Dict[str, os.DirEntry]:
+        """返回目录下的文件项（get_pending_tasks 期间每个目录只 scandir 一次）"""
+        entries = self._dir_listings.get(parent)
+        if entries is None:
+            try:
+                with os.scandir(parent or '.') as it:
+                    entries = {entry.name: entry for entry in it}
+            except OSError:
+                entries = {}
+            self._dir_listings[parent] = entries
+        return entries
+    
+    def _output_exists(self, output_file: str) -> bool:
+        """检查输出文件是否存在
+        
+        在 get_pending_tasks 期间每个目录只 scandir 一次，之后同一目录下
+        的文件都查缓存的目录项；其他时候直接检查路径。
+        
+        Args:
+            output_file: 输出文件路径
+            
+        Returns:
+            文件是否存在
+        """
+        if self._dir_listings is None:
+            return Path(output_file).exists()
+        
+        parent, name = os.path.split(output_file)
+        return name in self._listing(parent)
+    
+    def _output_mtime(self, output_file: str) -> Optional[float]:
+        """返回输出文件的修改时间，文件不存在时返回 None
+        
+        get_pending_tasks 期间先查缓存的目录项，不存在的文件无需 stat；
+        DirEntry.stat() 的结果会缓存在目录项上。
+        
+        Args:
+            output_file: 输出文件路径
+            
+        Returns:
+            修改时间，文件不存在或无法访问时返回 None
+        """
+        if self._dir_listings is None:
+            return _stat_mtime(output_file)
+        
+        parent, name = os.path.split(output_file)
+        entry = self._listing(parent).get(name)
+        if entry is None:
+            return None
+        try:
+            return entry.stat().st_mtime
+        except OSError:
+            return None
+    
     def mark_completed(
         self,
         drama_dir: Path,
@@ -149,17 +375,19 @@ class StateManager:
             output_files: 输出文件列表
         """
         key = self.get_state_key(drama_dir, operation)
+        output_paths = [str(f) for f in output_files]
         
         self.states[key] = ProcessingState(
             drama_dir=str(drama_dir),
             operation=operation,
             status=ProcessingStatus.COMPLETED,
             timestamp=datetime.now().isoformat(),
-            output_files=[str(f) for f in output_files],
-            error_message=None
+            output_files=output_paths,
+            error_message=None,
+            output_mtimes=[_stat_mtime(f) for f in output_paths]
         )
         
-        self.save_state()
+        self._append(key)
     
     def mark_failed(
         self,
@@ -185,7 +413,7 @@ class StateManager:
             error_message=error_message
         )
         
-        self.save_state()
+        self._append(key)
     
     def get_pending_tasks(
         self,
@@ -201,13 +429,15 @@ class StateManager:
         Returns:
             待处理的目录列表
         """
-        pending = []
-        
-        for drama_dir in drama_dirs:
-            if not self.is_completed(drama_dir, operation):
-                pending.append(drama_dir)
-        
-        return pending
+        # 目录列表只在本次检查期间有效，结束后丢弃，不会看到过期的结果
+        self._dir_listings = {}
+        try:
+            return [
+                drama_dir for drama_dir in drama_dirs
+                if not self.is_completed(drama_dir, operation)
+            ]
+        finally:
+            self._dir_listings = None
     
     def get_summary(self) -> Dict[str, int]:
         """获取处理摘要
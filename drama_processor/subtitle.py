@@ -4,17 +4,195 @@
 支持 SRT 和 ASS 格式的字幕解析、编辑和保存。
 """
 
+import mmap
+import os
+import re
 from abc import ABC, abstractmethod
+from dataclasses import dataclass
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
 
-from .models import SubtitleEntry, SubtitleFormat
+from .models import DATACLASS_SLOTS, SubtitleEntry, SubtitleFormat
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+# 条目数超过该值时时间列使用 numpy 数组，偏移等批量运算在 C 层完成
+_NUMPY_SHIFT_MIN = 1000
+
+# 超过该大小的字幕文件通过 mmap 读取，直接从映射解码，不再额外复制一份字节串
+_MMAP_MIN_BYTES = 1 << 20
+
+
+# SRT 字幕块：序号行、时间戳行，以及直到空行为止的一行或多行文本。
+# 时间戳各字段单独捕获，直接换算为秒，不再逐块 split 和 strip
+_SRT_BLOCK_RE = re.compile(
+    r'^[ \t]*(\d+)[ \t]*\r?\n'
+    r'[ \t]*(\d+):(\d+):(\d+)[,.](\d{1,3})[ \t]*-->[ \t]*'
+    r'(\d+):(\d+):(\d+)[,.](\d{1,3})[^\r\n]*\r?\n'
+    r'((?:[ \t]*\S[^\r\n]*(?:\r?\n|\Z))+)',
+    re.MULTILINE
+)
+
+# SRT 时间戳行（缩进、开始时间、箭头、结束时间），用于只改写时间戳
+_SRT_TIMING_RE = re.compile(
+    r'^([ \t]*)(\d+):(\d+):(\d+)[,.](\d{1,3})([ \t]*-->[ \t]*)(\d+):(\d+):(\d+)[,.](\d{1,3})',
+    re.MULTILINE
+)
+
+# ASS Dialogue 行的开始和结束时间字段
+_ASS_TIMING_RE = re.compile(r'^([ \t]*Dialogue:[^,\n]*,)([^,\n]*),([^,\n]*),', re.MULTILINE)
+
+# ASS Dialogue 行：Layer,Start,End,Style,Name,MarginL,MarginR,MarginV,Effect,Text
+# 只捕获 Start、End、Style 和 Text；Text 可能包含逗号，取到行尾
+_ASS_DIALOGUE_RE = re.compile(
+    r'^[ \t]*Dialogue:[^,\n]*,([^,\n]*),([^,\n]*),([^,\n]*),(?:[^,\n]*,){5}([^\n]*)',
+    re.MULTILINE
+)
+
+# ASS 头部中的样式行（整行、样式名）
+_ASS_STYLE_RE = re.compile(r'^[ \t]*(Style:([^,\n]*)[^\n]*)', re.MULTILINE)
+
+# 小数部分按位数换算为秒的除数（"5" -> 0.5，"500" -> 0.5）
+_FRACTION_DIVISORS = (1, 10, 100, 1000)
+
+# 时间字段补零查表，写出时直接拼接，省去每个字段的格式说明解析
+_PAD2 = [f"{i:02d}" for i in range(100)]
+_PAD3 = [f"{i:03d}" for i in range(1000)]
+
+
+def _to_seconds(hours: str, minutes: str, seconds: str, fraction: str) -> float:
+    """把时间戳的各字段换算为秒
+    
+    Args:
+        hours: 小时
+        minutes: 分钟
+        seconds: 秒
+        fraction: 秒的小数部分（1-3 位数字）
+        
+    Returns:
+        时间（秒）
+    """
+    # 秒和小数部分先合成整数再做一次除法，结果与 float("SS.fff") 完全一致
+    divisor = _FRACTION_DIVISORS[len(fraction)]
+    return (
+        int(hours) * 3600 + int(minutes) * 60
+        + (int(seconds) * divisor + int(fraction)) / divisor
+    )
+
+
+def _read_text(file_path: Path) -> str:
+    """以 UTF-8 读取字幕文件全文，并把 CRLF、CR 换行统一为 LF（与文本模式一致）
+    
+    Args:
+        file_path: 字幕文件路径
+        
+    Returns:
+        文件内容
+    """
+    with open(file_path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size > _MMAP_MIN_BYTES:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                text = str(mm, 'utf-8')
+        else:
+            text = f.read().decode('utf-8')
+    
+    if '\r' in text:
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+    return text
+
+
+def _time_column(values: List[float]) -> Sequence[float]:
+    """构造时间列：条目较多且安装了 numpy 时为 float64 数组，否则为列表"""
+    if np is not None and len(values) > _NUMPY_SHIFT_MIN:
+        return np.array(values, dtype=np.float64)
+    return values
+
+
+def _as_list(values: Sequence[float]) -> List[float]:
+    """把时间列转换为 Python float 列表"""
+    return values.tolist() if np is not None and isinstance(values, np.ndarray) else values
+
+
+@dataclass(**DATACLASS_SLOTS)
+class SubtitleColumns:
+    """按列存储的字幕条目
+    
+    各字段是等长的并行序列，第 i 个条目由各列的第 i 个元素组成。
+    时间偏移等只涉及时间的操作直接作用于时间列，不必逐个访问条目对象。
+    
+    Attributes:
+        indices: 字幕序号列表
+        starts: 开始时间（秒），条目较多时为 numpy 数组
+        ends: 结束时间（秒），条目较多时为 numpy 数组
+        texts: 字幕文本列表
+        styles: 样式信息列表（ASS 格式使用）
+    """
+    indices: List[int]
+    starts: Sequence[float]
+    ends: Sequence[float]
+    texts: List[str]
+    styles: List[Optional[str]]
+    
+    @classmethod
+    def from_entries(cls, entries: List[SubtitleEntry]) -> 'SubtitleColumns':
+        """由字幕条目列表构造列数据"""
+        return cls(
+            indices=[entry.index for entry in entries],
+            starts=_time_column([entry.start_time for entry in entries]),
+            ends=_time_column([entry.end_time for entry in entries]),
+            texts=[entry.text for entry in entries],
+            styles=[entry.style for entry in entries]
+        )
+    
+    def __len__(self) -> int:
+        return len(self.indices)
+    
+    def entry(self, i: int) -> SubtitleEntry:
+        """构造第 i 个条目"""
+        return SubtitleEntry(
+            self.indices[i], float(self.starts[i]), float(self.ends[i]),
+            self.texts[i], self.styles[i]
+        )
+    
+    def to_entries(self) -> List[SubtitleEntry]:
+        """构造全部字幕条目"""
+        return [
+            SubtitleEntry(index, start, end, text, style)
+            for index, start, end, text, style in zip(
+                self.indices, _as_list(self.starts), _as_list(self.ends),
+                self.texts, self.styles
+            )
+        ]
+    
+    def shifted(self, offset_seconds: float) -> 'SubtitleColumns':
+        """返回时间偏移后的列数据
+        
+        只重新计算两个时间列，序号、文本和样式列与原数据共享（不会被原地修改）。
+        
+        Args:
+            offset_seconds: 偏移量（秒）
+            
+        Returns:
+            新的 SubtitleColumns 实例
+        """
+        if np is not None and isinstance(self.starts, np.ndarray):
+            starts = self.starts + offset_seconds
+            ends = self.ends + offset_seconds
+        else:
+            starts = [start + offset_seconds for start in self.starts]
+            ends = [end + offset_seconds for end in self.ends]
+        return SubtitleColumns(self.indices, starts, ends, self.texts, self.styles)
 
 
 class SubtitleParser(ABC):
     """字幕解析器基类
     
-    定义字幕解析和格式化的接口。
+    定义字幕解析和格式化的接口。解析器不保存任何与文件相关的状态，
+    同一个实例可以被多个文件、多个线程共用。
     """
     
     @abstractmethod
@@ -29,6 +207,17 @@ class SubtitleParser(ABC):
         """
         pass
     
+    def parse_with_header(self, file_path: Path) -> Tuple[List[SubtitleEntry], str]:
+        """解析字幕文件，同时返回文件头部
+        
+        Args:
+            file_path: 字幕文件路径
+            
+        Returns:
+            (字幕条目列表, 原始文件头部)；没有头部的格式返回空串
+        """
+        return self.parse(file_path), ''
+    
     @abstractmethod
     def format_entry(self, entry: SubtitleEntry) -> str:
         """格式化单个字幕条目
@@ -41,10 +230,37 @@ class SubtitleParser(ABC):
         """
         pass
     
+    def format_all(self, entries: List[SubtitleEntry]) -> str:
+        """格式化所有字幕条目（不含文件头部）
+        
+        子类可以覆盖该方法，批量格式化以减少逐条调用的开销。
+        
+        Args:
+            entries: 字幕条目列表
+            
+        Returns:
+            可直接写在文件头部之后的字符串
+        """
+        return ''.join(map(self.format_entry, entries))
+    
+    def format_columns(self, columns: SubtitleColumns) -> str:
+        """格式化按列存储的字幕条目（不含文件头部）
+        
+        Args:
+            columns: 列数据
+            
+        Returns:
+            可直接写在文件头部之后的字符串
+        """
+        return self.format_all(columns.to_entries())
+    
     @abstractmethod
-    def get_header(self) -> str:
-        """获取文件头部（ASS 格式需要）
+    def get_header(self, header: str = '') -> str:
+        """获取保存时写在条目之前的文件头部（ASS 格式需要）
         
+        Args:
+            header: parse_with_header 返回的原始头部，为空时使用默认头部
+            
         Returns:
             文件头部字符串
         """
@@ -79,43 +295,27 @@ class SRTParser(SubtitleParser):
             FileNotFoundError: 文件不存在
             ValueError: 文件格式错误
         """
-        entries = []
-        
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+        content = _read_text(file_path)
         
         # 解析 SRT 格式
         # 格式: 序号\n时间戳\n文本\n\n
-        blocks = content.strip().split('\n\n')
-        
-        for block in blocks:
-            lines = block.strip().split('\n')
-            if len(lines) >= 3:
-                try:
-                    # 解析序号
-                    index = int(lines[0])
-                    
-                    # 解析时间戳行: 00:00:01,000 --> 00:00:03,000
-                    time_line = lines[1]
-                    if ' --> ' not in time_line:
-                        continue  # 跳过格式错误的行
-                    
-                    start_str, end_str = time_line.split(' --> ')
-                    start_time = self._parse_srt_time(start_str.strip())
-                    end_time = self._parse_srt_time(end_str.strip())
-                    
-                    # 解析文本（可能多行）
-                    text = '\n'.join(lines[2:])
-                    
-                    entries.append(SubtitleEntry(
-                        index=index,
-                        start_time=start_time,
-                        end_time=end_time,
-                        text=text
-                    ))
-                except (ValueError, IndexError) as e:
-                    # 跳过格式错误的块
-                    continue
+        # 格式错误的块不匹配，直接跳过
+        entries = []
+        for match in _SRT_BLOCK_RE.finditer(content):
+            (index,
+             start_h, start_m, start_s, start_frac,
+             end_h, end_m, end_s, end_frac,
+             text) = match.groups()
+            
+            # 文本（可能多行）去掉末尾的换行
+            text = text.rstrip()
+            
+            entries.append(SubtitleEntry(
+                index=int(index),
+                start_time=_to_seconds(start_h, start_m, start_s, start_frac),
+                end_time=_to_seconds(end_h, end_m, end_s, end_frac),
+                text=text
+            ))
         
         return entries
     
@@ -135,16 +335,9 @@ class SRTParser(SubtitleParser):
             >>> parser._parse_srt_time("01:23:45,678")
             5025.678
         """
-        # 格式: 00:00:01,000
-        # 将逗号替换为点，方便解析毫秒
-        time_str = time_str.replace(',', '.')
-        parts = time_str.split(':')
-        
-        hours = int(parts[0])
-        minutes = int(parts[1])
-        seconds = float(parts[2])
-        
-        return hours * 3600 + minutes * 60 + seconds
+        # 格式: 00:00:01,000，各字段宽度固定，按位置切片（小时从末尾
+        # 倒数，允许超过两位）
+        return _to_seconds(time_str[:-10], time_str[-9:-7], time_str[-6:-4], time_str[-3:])
     
     def _format_srt_time(self, seconds: float) -> str:
         """格式化秒为 SRT 时间格式
@@ -162,13 +355,14 @@ class SRTParser(SubtitleParser):
             >>> parser._format_srt_time(5025.678)
             '01:23:45,678'
         """
-        hours = int(seconds // 3600)
-        minutes = int((seconds % 3600) // 60)
-        secs = seconds % 60
-        millisecs = int((secs % 1) * 1000)
-        secs = int(secs)
-        
-        return f"{hours:02d}:{minutes:02d}:{secs:02d},{millisecs:03d}"
+        # 先四舍五入到整数毫秒，再用整数运算拆分各字段
+        # （浮点取余截断会把 1.001 之类的时间写成 1.000）
+        hours, millisecs = divmod(int(round(seconds * 1000)), 3600000)
+        minutes, millisecs = divmod(millisecs, 60000)
+        secs, millisecs = divmod(millisecs, 1000)
+        
+        hh = _PAD2[hours] if 0 <= hours < 100 else f"{hours:02d}"
+        return hh + ':' + _PAD2[minutes] + ':' + _PAD2[secs] + ',' + _PAD3[millisecs]
     
     def format_entry(self, entry: SubtitleEntry) -> str:
         """格式化为 SRT 格式
@@ -189,9 +383,73 @@ class SRTParser(SubtitleParser):
         end = self._format_srt_time(entry.end_time)
         return f"{entry.index}\n{start} --> {end}\n{entry.text}\n"
     
-    def get_header(self) -> str:
+    def format_all(self, entries: List[SubtitleEntry]) -> str:
+        """格式化所有字幕条目，条目之间以空行分隔
+        
+        Args:
+            entries: 字幕条目列表
+            
+        Returns:
+            SRT 文件内容
+        """
+        return self._format_rows(
+            (entry.index, entry.start_time, entry.end_time, entry.text)
+            for entry in entries
+        )
+    
+    def format_columns(self, columns: SubtitleColumns) -> str:
+        """按列格式化所有字幕条目，条目之间以空行分隔
+        
+        与 format_all 的结果相同，直接并行遍历各列，不转换回条目对象。
+        
+        Args:
+            columns: 列数据
+            
+        Returns:
+            SRT 文件内容
+        """
+        return self._format_rows(zip(
+            columns.indices, _as_list(columns.starts), _as_list(columns.ends), columns.texts
+        ))
+    
+    @staticmethod
+    def _format_rows(rows: Iterable[Tuple[int, float, float, str]]) -> str:
+        """格式化 (序号, 开始时间, 结束时间, 文本) 序列，条目之间以空行分隔
+        
+        与逐条调用 format_entry 的结果相同，时间格式化内联在循环中，
+        每个条目只构造一次字符串。
+        
+        Args:
+            rows: (序号, 开始时间, 结束时间, 文本) 的可迭代对象
+            
+        Returns:
+            SRT 文件内容
+        """
+        parts = []
+        append = parts.append
+        for index, start, end, text in rows:
+            start_h, start_ms = divmod(int(round(start * 1000)), 3600000)
+            start_m, start_ms = divmod(start_ms, 60000)
+            start_s, start_ms = divmod(start_ms, 1000)
+            end_h, end_ms = divmod(int(round(end * 1000)), 3600000)
+            end_m, end_ms = divmod(end_ms, 60000)
+            end_s, end_ms = divmod(end_ms, 1000)
+            start_hh = _PAD2[start_h] if 0 <= start_h < 100 else f"{start_h:02d}"
+            end_hh = _PAD2[end_h] if 0 <= end_h < 100 else f"{end_h:02d}"
+            append(
+                f"{index}\n"
+                f"{start_hh}:{_PAD2[start_m]}:{_PAD2[start_s]},{_PAD3[start_ms]} --> "
+                f"{end_hh}:{_PAD2[end_m]}:{_PAD2[end_s]},{_PAD3[end_ms]}\n"
+                f"{text}\n\n"
+            )
+        return ''.join(parts)
+    
+    def get_header(self, header: str = '') -> str:
         """SRT 没有头部
         
+        Args:
+            header: 忽略
+            
         Returns:
             空字符串
         """
@@ -216,16 +474,6 @@ class ASSParser(SubtitleParser):
         Dialogue: 0,0:00:01.00,0:00:03.00,Default,,0,0,0,,第一条字幕
     """
     
-    def __init__(self):
-        """初始化 ASS 解析器
-        
-        Attributes:
-            header_lines: 存储头部信息的行列表
-            styles: 存储样式信息的字典
-        """
-        self.header_lines: List[str] = []
-        self.styles: dict = {}
-    
     def parse(self, file_path: Path) -> List[SubtitleEntry]:
         """解析 ASS 文件
         
@@ -235,71 +483,82 @@ class ASSParser(SubtitleParser):
         Returns:
             字幕条目列表
             
+        Raises:
+            FileNotFoundError: 文件不存在
+            ValueError: 文件格式错误
+        """
+        return self.parse_with_header(file_path)[0]
+    
+    def parse_with_header(self, file_path: Path) -> Tuple[List[SubtitleEntry], str]:
+        """解析 ASS 文件，同时返回 [Events] 之前的原始头部
+        
+        Args:
+            file_path: ASS 文件路径
+            
+        Returns:
+            (字幕条目列表, 原始头部)；文件没有头部时头部为空串
+            
         Raises:
             FileNotFoundError: 文件不存在
             ValueError: 文件格式错误
         """
         entries = []
         
-        with open(file_path, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
+        # 一次读入整个文件（_read_text 已把 \r\n 统一为 \n）
+        text = _read_text(file_path)
         
-        in_events = False
+        # [Events] 之前的内容原样保存为头部，保存时直接输出，
+        # 不再逐行 strip 后重新拼接；只有其后的事件部分需要逐行解析
+        if text.startswith('[Events]'):
+            events_start = 0
+        else:
+            marker = text.find('\n[Events]')
+            events_start = marker + 1 if marker >= 0 else len(text)
+        
+        header = text[:events_start]
+        if not header.strip():
+            header = ''
+        elif events_start == len(text):
+            # 没有 [Events] 部分：整个文件都是头部，补上与 [Events] 之间的空行
+            header = header.rstrip('\n') + '\n\n'
+        
+        # 解析事件行（Dialogue）：正则一次扫描事件部分，非 Dialogue 行
+        # 和字段不足 10 个的行不匹配
         index = 1
-        
-        for line in lines:
-            line = line.strip()
-            
-            # 检测 [Events] 部分
-            if line.startswith('[Events]'):
-                in_events = True
-                continue
-            
-            # 保存头部信息（[Events] 之前的所有内容）
-            if not in_events:
-                self.header_lines.append(line)
-                
-                # 解析样式信息
-                if line.startswith('Style:'):
-                    parts = line.split(':', 1)[1].split(',')
-                    if parts:
-                        style_name = parts[0].strip()
-                        self.styles[style_name] = line
+        for match in _ASS_DIALOGUE_RE.finditer(text, events_start):
+            start_str, end_str, style, dialogue = match.groups()
+            try:
+                start_time = self._parse_ass_time(start_str.strip())
+                end_time = self._parse_ass_time(end_str.strip())
+            except (ValueError, IndexError):
+                # 跳过格式错误的行
                 continue
             
-            # 解析事件行（Dialogue）
-            if line.startswith('Dialogue:'):
-                try:
-                    # ASS Dialogue 格式：
-                    # Dialogue: Layer,Start,End,Style,Name,MarginL,MarginR,MarginV,Effect,Text
-                    # 注意：Text 部分可能包含逗号，所以只分割前 9 个字段
-                    parts = line.split(':', 1)[1].split(',', 9)
-                    
-                    if len(parts) >= 10:
-                        # Layer = parts[0]
-                        start_time = self._parse_ass_time(parts[1].strip())
-                        end_time = self._parse_ass_time(parts[2].strip())
-                        style = parts[3].strip()
-                        # Name = parts[4]
-                        # MarginL = parts[5]
-                        # MarginR = parts[6]
-                        # MarginV = parts[7]
-                        # Effect = parts[8]
-                        text = parts[9].strip()
-                        
-                        entries.append(SubtitleEntry(
-                            index=index,
-                            start_time=start_time,
-                            end_time=end_time,
-                            text=text,
-                            style=style
-                        ))
-                        index += 1
-                except (ValueError, IndexError) as e:
-                    # 跳过格式错误的行
-                    continue
+            entries.append(SubtitleEntry(
+                index=index,
+                start_time=start_time,
+                end_time=end_time,
+                text=dialogue.strip(),
+                style=style.strip()
+            ))
+            index += 1
+        
+        return entries, header
+    
+    @staticmethod
+    def parse_styles(header: str) -> Dict[str, str]:
+        """从头部中提取样式定义
         
-        return entries
+        Args:
+            header: parse_with_header 返回的原始头部
+            
+        Returns:
+            样式名到完整 Style 行的字典
+        """
+        return {
+            match.group(2).strip(): match.group(1).strip()
+            for match in _ASS_STYLE_RE.finditer(header)
+        }
     
     def _parse_ass_time(self, time_str: str) -> float:
         """解析 ASS 时间格式为秒
@@ -318,6 +577,19 @@ class ASSParser(SubtitleParser):
             5025.67
         """
         # 格式: 0:00:01.00 或 1:23:45.67
+        # 常见的两位分钟格式直接按位置切片，不构造 split 列表
+        colon = time_str.find(':')
+        if colon > 0 and time_str[colon + 3:colon + 4] == ':':
+            try:
+                return (
+                    int(time_str[:colon]) * 3600
+                    + int(time_str[colon + 1:colon + 3]) * 60
+                    + float(time_str[colon + 4:])
+                )
+            except ValueError:
+                pass
+        
+        # 其他写法（如 "0:0:1.5"）按冒号拆分
         parts = time_str.split(':')
         
         hours = int(parts[0])
@@ -342,12 +614,13 @@ class ASSParser(SubtitleParser):
             >>> parser._format_ass_time(5025.67)
             '1:23:45.67'
         """
-        hours = int(seconds // 3600)
-        minutes = int((seconds % 3600) // 60)
-        secs = seconds % 60
+        # ASS 格式使用两位小数的秒数：先四舍五入到整数厘秒再拆分，
+        # 进位不会产生 "0:00:60.00" 这样的秒字段
+        hours, centisecs = divmod(int(round(seconds * 100)), 360000)
+        minutes, centisecs = divmod(centisecs, 6000)
+        secs, centisecs = divmod(centisecs, 100)
         
-        # ASS 格式使用两位小数的秒数
-        return f"{hours}:{minutes:02d}:{secs:05.2f}"
+        return str(hours) + ':' + _PAD2[minutes] + ':' + _PAD2[secs] + '.' + _PAD2[centisecs]
     
     def format_entry(self, entry: SubtitleEntry) -> str:
         """格式化为 ASS 格式
@@ -371,22 +644,25 @@ class ASSParser(SubtitleParser):
         # ASS 格式: Dialogue: Layer,Start,End,Style,Name,MarginL,MarginR,MarginV,Effect,Text
         return f"Dialogue: 0,{start},{end},{style},,0,0,0,,{entry.text}\n"
     
-    def get_header(self) -> str:
+    def get_header(self, header: str = '') -> str:
         """获取 ASS 文件头部
         
+        Args:
+            header: parse_with_header 返回的原始头部
+            
         Returns:
             ASS 文件头部字符串，包括 [Script Info]、[V4+ Styles] 和 [Events] 格式行
         """
         # 如果没有头部信息，返回默认头部
-        if not self.header_lines:
+        if not header:
             return self._get_default_header()
         
         # 返回保存的头部信息，并添加 [Events] 部分的格式行
-        header = '\n'.join(self.header_lines)
-        header += '\n\n[Events]\n'
-        header += 'Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text\n'
-        
-        return header
+        return (
+            header
+            + '[Events]\n'
+            'Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text\n'
+        )
     
     def _get_default_header(self) -> str:
         """获取默认的 ASS 文件头部
@@ -407,21 +683,80 @@ Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
 """
 
 
+# 扩展名 -> (解析器, 格式)；解析器无状态，所有文件共用同一个实例
+_PARSER_CACHE: Dict[str, Tuple[SubtitleParser, SubtitleFormat]] = {
+    '.srt': (SRTParser(), SubtitleFormat.SRT),
+    '.ass': (ASSParser(), SubtitleFormat.ASS),
+}
+
+
 class SubtitleFile:
     """字幕文件
     
     封装字幕文件的解析、编辑和保存操作。
+    
+    条目可以按对象列表（entries）或按列（SubtitleColumns）存储，任一时刻
+    只有一种是有效数据。shift_all 得到的新文件按列存储，保存时直接按列
+    格式化；访问 entries 时才构造条目对象，之后以条目列表为准（调用方
+    可能原地修改条目）。
     """
     
     def __init__(
         self, 
-        entries: List[SubtitleEntry],
+        entries: Optional[List[SubtitleEntry]],
         format: SubtitleFormat,
-        parser: SubtitleParser
+        parser: SubtitleParser,
+        columns: Optional[SubtitleColumns] = None,
+        header: str = ''
     ):
-        self.entries = entries
+        """初始化字幕文件
+        
+        Args:
+            entries: 字幕条目列表；为 None 时使用 columns
+            format: 字幕格式
+            parser: 用于保存的解析器
+            columns: 按列存储的字幕条目（entries 为 None 时使用）
+            header: 解析时得到的原始文件头部（ASS 格式），为空时保存默认头部
+        """
+        self._entries = entries
+        self._columns = columns if entries is None else None
         self.format = format
         self.parser = parser
+        self.header = header
+    
+    @property
+    def entries(self) -> List[SubtitleEntry]:
+        """字幕条目列表（按列存储时在首次访问时构造）"""
+        if self._entries is None:
+            self._entries = self._columns.to_entries() if self._columns is not None else []
+            self._columns = None
+        return self._entries
+    
+    @entries.setter
+    def entries(self, entries: List[SubtitleEntry]) -> None:
+        self._entries = entries
+        self._columns = None
+    
+    @property
+    def columns(self) -> SubtitleColumns:
+        """按列存储的字幕条目
+        
+        以条目列表为准时每次由条目重新构造，不会与被修改的条目不一致。
+        """
+        if self._columns is not None:
+            return self._columns
+        return SubtitleColumns.from_entries(self.entries)
+    
+    def __len__(self) -> int:
+        if self._entries is None and self._columns is not None:
+            return len(self._columns)
+        return len(self.entries)
+    
+    def __getitem__(self, i: int) -> SubtitleEntry:
+        """获取第 i 个条目（按列存储时返回新构造的条目）"""
+        if self._entries is None and self._columns is not None:
+            return self._columns.entry(i)
+        return self.entries[i]
     
     @classmethod
     def parse(cls, file_path: Path) -> 'SubtitleFile':
@@ -445,24 +780,18 @@ class SubtitleFile:
             >>> print(f"格式: {subtitle.format}, 条目数: {len(subtitle.entries)}")
             格式: SubtitleFormat.SRT, 条目数: 10
         """
-        # 获取文件扩展名（转换为小写）
+        # 根据扩展名（转换为小写）选择共用的解析器
         ext = file_path.suffix.lower()
-        
-        # 根据扩展名选择解析器
-        if ext == '.srt':
-            parser = SRTParser()
-            format = SubtitleFormat.SRT
-        elif ext == '.ass':
-            parser = ASSParser()
-            format = SubtitleFormat.ASS
-        else:
-            raise ValueError(f"不支持的字幕格式: {ext}，仅支持 .srt 和 .ass")
+        try:
+            parser, format = _PARSER_CACHE[ext]
+        except KeyError:
+            raise ValueError(f"不支持的字幕格式: {ext}，仅支持 .srt 和 .ass") from None
         
         # 解析文件
-        entries = parser.parse(file_path)
+        entries, header = parser.parse_with_header(file_path)
         
         # 创建并返回 SubtitleFile 实例
-        return cls(entries, format, parser)
+        return cls(entries, format, parser, header=header)
     
     def save(self, file_path: Path) -> None:
         """保存字幕文件
@@ -480,20 +809,14 @@ class SubtitleFile:
         # 确保父目录存在
         file_path.parent.mkdir(parents=True, exist_ok=True)
         
-        # 打开文件写入
-        with open(file_path, 'w', encoding='utf-8') as f:
-            # 写入头部（如果有）
-            header = self.parser.get_header()
-            if header:
-                f.write(header)
-            
-            # 写入所有字幕条目
-            for entry in self.entries:
-                f.write(self.parser.format_entry(entry))
-                
-                # SRT 格式需要在每个条目后添加额外的空行
-                if self.format == SubtitleFormat.SRT:
-                    f.write('\n')
+        # 头部（SRT 为空串）和所有条目拼成一个字符串，一次写入；
+        # SRT 条目之间的空行由 SRTParser.format_all 负责
+        if self._columns is not None:
+            body = self.parser.format_columns(self._columns)
+        else:
+            body = self.parser.format_all(self.entries)
+        content = self.parser.get_header(self.header) + body
+        file_path.write_text(content, encoding='utf-8')
     
     def shift_all(self, offset_seconds: float) -> 'SubtitleFile':
         """偏移所有字幕时间戳
@@ -513,15 +836,69 @@ class SubtitleFile:
             >>> shifted = subtitle.shift_all(30.0)
             >>> shifted.save(Path("video2_shifted.srt"))
         """
-        # 对所有条目应用时间戳偏移
-        shifted_entries = [
-            entry.shift_time(offset_seconds)
-            for entry in self.entries
-        ]
-        
+        # 只对两个时间列做偏移（条目较多时为 numpy 数组的一次加法），
+        # 序号、文本和样式列直接共享
         # 创建并返回新的 SubtitleFile 实例
         # 保持相同的格式和解析器
-        return SubtitleFile(shifted_entries, self.format, self.parser)
+        return SubtitleFile(
+            None, self.format, self.parser,
+            columns=self.columns.shifted(offset_seconds),
+            header=self.header
+        )
+    
+    @classmethod
+    def shift_file(cls, src: Path, dst: Path, offset_seconds: float) -> None:
+        """把字幕文件的时间戳整体偏移后另存
+        
+        只用正则替换时间戳（SRT 的时间戳行、ASS 的 Dialogue 开始和结束
+        时间），不构造字幕条目，文件其余内容（头部、样式、文本、序号）
+        原样保留。只需要偏移时间轴、不需要重新编号时比
+        parse().shift_all().save() 快得多。
+        
+        Args:
+            src: 源字幕文件路径（.srt 或 .ass）
+            dst: 输出文件路径
+            offset_seconds: 偏移量（秒），正数向后偏移，负数向前偏移
+            
+        Raises:
+            ValueError: 不支持的字幕格式
+            FileNotFoundError: 文件不存在
+        """
+        ext = src.suffix.lower()
+        
+        if ext == '.srt':
+            format_time = SRTParser()._format_srt_time
+            
+            def shift(match: 're.Match[str]') -> str:
+                start = _to_seconds(*match.group(2, 3, 4, 5)) + offset_seconds
+                end = _to_seconds(*match.group(7, 8, 9, 10)) + offset_seconds
+                return f"{match.group(1)}{format_time(start)}{match.group(6)}{format_time(end)}"
+            
+            pattern = _SRT_TIMING_RE
+        elif ext == '.ass':
+            ass_parser = _PARSER_CACHE['.ass'][0]
+            
+            def shift(match: 're.Match[str]') -> str:
+                try:
+                    start = ass_parser._parse_ass_time(match.group(2).strip()) + offset_seconds
+                    end = ass_parser._parse_ass_time(match.group(3).strip()) + offset_seconds
+                except (ValueError, IndexError):
+                    # 时间格式错误的行保持原样
+                    return match.group(0)
+                return (
+                    f"{match.group(1)}{ass_parser._format_ass_time(start)},"
+                    f"{ass_parser._format_ass_time(end)},"
+                )
+            
+            pattern = _ASS_TIMING_RE
+        else:
+            raise ValueError(f"不支持的字幕格式: {ext}，仅支持 .srt 和 .ass")
+        
+        content = pattern.sub(shift, src.read_text(encoding='utf-8'))
+        
+        # 确保父目录存在
+        dst.parent.mkdir(parents=True, exist_ok=True)
+        dst.write_text(content, encoding='utf-8')
     
     def get_extension(self) -> str:
         """获取文件扩展名
@@ -4,15 +4,64 @@
 生成多种分辨率和格式的视频文件。
 """
 
+import os
 import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Set, Tuple
 
 from .interfaces import VideoProcessor, ProgressCallback
 from .models import ProcessingResult, ProcessingStatus, TranscodeSpec
 from .ffmpeg_wrapper import FFmpegWrapper, FFmpegError, OptimizedFFmpegWrapper
 from .logger import ProcessingLogger
 from .file_manager import FileManager
+from .progress import LockedProgressCallback
+
+
+@lru_cache(maxsize=1024)
+def _probe_video_info(path_str: str, mtime_ns: int, size: int) -> Dict[str, Any]:
+    """探测视频信息（带缓存）
+    
+    mtime_ns 和 size 只作为缓存键的一部分：文件被重写后键随之变化，
+    不会返回过期的信息。探测失败时抛出异常，不会被缓存。
+    
+    Args:
+        path_str: 视频文件路径
+        mtime_ns: 文件修改时间（纳秒）
+        size: 文件大小（字节）
+        
+    Returns:
+        视频信息字典（与 FFmpegWrapper.get_video_info 相同），调用方不应修改
+    """
+    return FFmpegWrapper().get_video_info(Path(path_str))
+
+
+def _scan_cleared_dir(cleared_dir: Path) -> Tuple[List[Path], List[Path]]:
+    """一次 scandir 找出目录中的视频和字幕文件
+    
+    与 glob("*.mp4")、glob("*.srt") + glob("*.ass") 的结果相同
+    （区分大小写），但目录只读取一次。
+    
+    Args:
+        cleared_dir: cleared/ 目录路径
+        
+    Returns:
+        (视频文件列表, 字幕文件列表)，字幕中 .srt 在前、.ass 在后
+    """
+    video_files = []
+    srt_files = []
+    ass_files = []
+    with os.scandir(cleared_dir) as it:
+        for entry in it:
+            name = entry.name
+            if name.endswith('.mp4'):
+                video_files.append(Path(entry.path))
+            elif name.endswith('.srt'):
+                srt_files.append(Path(entry.path))
+            elif name.endswith('.ass'):
+                ass_files.append(Path(entry.path))
+    return video_files, srt_files + ass_files
 
 
 class VideoTranscoder(VideoProcessor):
@@ -29,26 +78,86 @@ class VideoTranscoder(VideoProcessor):
         TranscodeSpec(854, 480),    # 480p
     ]
     
+    # 输入已是 8 位 yuv420p 的 H.264、分辨率不低于目标且超出不超过该比例、
+    # 码率不高于 REMUX_MAX_BITRATES 时直接复制视频流
+    REMUX_TOLERANCE = 0.05
+    
+    # 直接复制视频流时允许的最高视频码率（bit/s），未列出的规格总是重新编码
+    REMUX_MAX_BITRATES = {"1080p": 5_000_000, "720p": 2_500_000, "480p": 1_200_000}
+    
+    # 默认的按规格编码预设：480p 主要用于预览，用最快的预设尽快产出
+    DEFAULT_SPEC_PRESETS = {"480p": "ultrafast"}
+    
     def __init__(
         self,
         specs: Optional[List[TranscodeSpec]] = None,
         enable_gpu: bool = False,
-        preset: str = "medium",
-        logger: Optional[ProcessingLogger] = None
+        preset: str = "faster",
+        logger: Optional[ProcessingLogger] = None,
+        batch_workers: Optional[int] = None,
+        tune: Optional[str] = "fastdecode",
+        threads: Optional[int] = None,
+        per_spec_preset: Optional[Dict[str, str]] = None,
+        fuse_outputs: bool = True
     ):
         """初始化视频转码器
         
         Args:
             specs: 转码规格列表，默认使用 PRESET_SPECS
             enable_gpu: 是否启用 GPU 加速
-            preset: 编码预设（ultrafast, fast, medium, slow 等）
+            preset: 编码预设（ultrafast, faster, medium, slow 等）。默认 faster：
+                编码明显快于 medium，画质差异（VMAF）很小；
+                需要原来的行为时显式传入 "medium"
             logger: 日志记录器
+            batch_workers: 批量处理时同时转码的短剧目录数，
+                默认为 CPU 核数的四分之一（至少为 1）
+            tune: CPU 编码时的 -tune 参数。默认 fastdecode，关闭 CABAC 和
+                去块滤波等解码开销大的特性，便于播放端解码；传 None 不指定
+            threads: 每个 FFmpeg 编码器的线程数，0 表示由编码器自动决定。
+                默认单独处理一个目录时由编码器自动决定（使用全部核数），
+                process_batch 同时转码多个目录时按 CPU 核数平分给各目录，
+                避免多个 FFmpeg 各自按全部核数开线程而相互争抢
+            per_spec_preset: 按分辨率名称覆盖 preset 的编码预设，
+                默认使用 DEFAULT_SPEC_PRESETS；传空字典则所有规格都用 preset
+            fuse_outputs: 是否用一次 FFmpeg 调用输出所有规格（默认）；为 False
+                时每个规格单独运行一个 FFmpeg，最多 4 个同时运行，可配合
+                threads 控制总线程数
         """
         self.specs = specs if specs is not None else self.PRESET_SPECS
-        self.ffmpeg = OptimizedFFmpegWrapper(enable_gpu=enable_gpu, preset=preset)
+        if batch_workers is None:
+            batch_workers = (os.cpu_count() or 1) // 4
+        self.batch_workers = max(1, batch_workers)
+        # None 表示未显式指定，由 process_batch 按并发数决定
+        self.threads = threads
+        if per_spec_preset is None:
+            per_spec_preset = self.DEFAULT_SPEC_PRESETS
+        self.ffmpeg = OptimizedFFmpegWrapper(
+            enable_gpu=enable_gpu, preset=preset, tune=tune, threads=threads or 0,
+            spec_presets=per_spec_preset
+        )
+        self.fuse_outputs = fuse_outputs
         self.file_manager = FileManager()
         self.logger = logger or ProcessingLogger()
     
+    def get_video_info(self, video_path: Path) -> Dict[str, Any]:
+        """获取视频信息，同一文件（路径、修改时间、大小都相同）只调用一次 ffprobe
+        
+        Args:
+            video_path: 视频文件路径
+            
+        Returns:
+            视频信息字典的副本
+            
+        Raises:
+            FFmpegError: 当无法获取视频信息时
+        """
+        try:
+            st = video_path.stat()
+        except OSError:
+            # 文件不存在等情况交给 ffmpeg 包装器给出原有的错误信息
+            return self.ffmpeg.get_video_info(video_path)
+        return dict(_probe_video_info(str(video_path), st.st_mtime_ns, st.st_size))
+    
     def get_video_resolution(self, video_path: Path) -> Tuple[int, int]:
         """获取视频分辨率
         
@@ -61,7 +170,7 @@ class VideoTranscoder(VideoProcessor):
         Raises:
             FFmpegError: 当无法获取视频信息时
         """
-        info = self.ffmpeg.get_video_info(video_path)
+        info = self.get_video_info(video_path)
         return (info['width'], info['height'])
     
     def transcode(
@@ -73,6 +182,8 @@ class VideoTranscoder(VideoProcessor):
     ) -> None:
         """转码视频
         
+        输出目录由调用方负责创建（process 中已创建 encoded/）。
+        
         Args:
             input_path: 输入视频路径
             output_path: 输出视频路径
@@ -82,19 +193,11 @@ class VideoTranscoder(VideoProcessor):
         Raises:
             FFmpegError: 当转码失败时
         """
-        # 确保输出目录存在
-        output_path.parent.mkdir(parents=True, exist_ok=True)
+        if __debug__:
+            assert output_path.parent.is_dir(), f"输出目录不存在: {output_path.parent}"
         
         # 构建转码命令
-        cmd = self.ffmpeg.build_transcode_command(input_path, output_path, spec)
-        
-        # 执行转码
-        from .ffmpeg_wrapper import FFmpegCommand
-        ffmpeg_cmd = FFmpegCommand(
-            inputs=[input_path],
-            output=output_path,
-            options=cmd[3:]  # 跳过 'ffmpeg -i input_path' 部分
-        )
+        ffmpeg_cmd = self.ffmpeg.build_transcode_ffmpeg_command(input_path, output_path, spec)
         
         # 定义进度回调
         def on_progress(percentage: float):
@@ -104,6 +207,130 @@ class VideoTranscoder(VideoProcessor):
         
         self.ffmpeg.execute(ffmpeg_cmd, progress_callback=on_progress)
     
+    def transcode_multi(
+        self,
+        input_path: Path,
+        targets: List[Tuple[TranscodeSpec, Path]],
+        progress_callback: Optional[ProgressCallback] = None
+    ) -> None:
+        """用一次 FFmpeg 调用把视频转码为多个规格
+        
+        输入只解码一次，再缩放到各目标分辨率分别编码，
+        比逐个规格调用 transcode 少解码 len(targets) - 1 次。
+        输出目录由调用方负责创建。
+        
+        Args:
+            input_path: 输入视频路径
+            targets: (转码规格, 输出视频路径) 列表
+            progress_callback: 可选的进度回调对象
+            
+        Raises:
+            FFmpegError: 当转码失败时
+        """
+        if not targets:
+            return
+        
+        if __debug__:
+            for _, output_path in targets:
+                assert output_path.parent.is_dir(), f"输出目录不存在: {output_path.parent}"
+        
+        ffmpeg_cmd = self.ffmpeg.build_multi_transcode_command(input_path, targets)
+        
+        # 定义进度回调
+        def on_progress(percentage: float):
+            if progress_callback:
+                # 这里可以更新进度信息
+                pass
+        
+        try:
+            self.ffmpeg.execute(ffmpeg_cmd, progress_callback=on_progress)
+        except FFmpegError:
+            if not ffmpeg_cmd.input_options:
+                raise
+            # NVDEC 不支持该输入的编码格式等情况下，改为 CPU 解码和缩放重试
+            self.logger.logger.warning(f"GPU 解码/缩放失败，改用 CPU 解码重试: {input_path}")
+            ffmpeg_cmd = self.ffmpeg.build_multi_transcode_command(
+                input_path, targets, hw_decode=False
+            )
+            self.ffmpeg.execute(ffmpeg_cmd, progress_callback=on_progress)
+    
+    def _output_path(
+        self,
+        encoded_dir: Path,
+        filename: str,
+        existing_names: Set[str],
+        run_tag: str
+    ) -> Path:
+        """为输出文件选择不会覆盖已有文件的路径
+        
+        名字未被占用时直接使用；否则在文件名后加上本次运行的时间标记
+        （如 ep_720p_20240101_120000.mp4），仍冲突时才回退到
+        FileManager.get_unique_path 的数字后缀。选中的名字会加入
+        existing_names，同一次运行中不会重复。
+        
+        Args:
+            encoded_dir: 输出目录
+            filename: 期望的文件名
+            existing_names: 输出目录中已存在（或本次已分配）的文件名
+            run_tag: 本次运行的时间标记
+            
+        Returns:
+            输出文件路径
+        """
+        if filename in existing_names:
+            stem, dot, suffix = filename.rpartition('.')
+            filename = f"{stem}_{run_tag}.{suffix}" if dot else f"{filename}_{run_tag}"
+            if filename in existing_names:
+                filename = self.file_manager.get_unique_path(encoded_dir / filename).name
+        existing_names.add(filename)
+        return encoded_dir / filename
+    
+    def _prefetch_video_info(self, drama_dir: Path) -> None:
+        """探测短剧目录中待转码视频的信息，只为填充缓存
+        
+        Args:
+            drama_dir: 短剧目录路径
+        """
+        try:
+            video_files, _ = _scan_cleared_dir(drama_dir / "cleared")
+            if video_files:
+                self.get_video_info(video_files[0])
+        except Exception:
+            # 预取失败不影响处理，process 中会重新探测并报告错误
+            pass
+    
+    def _transcode_parallel(
+        self,
+        input_path: Path,
+        targets: List[Tuple[TranscodeSpec, Path]],
+        progress_callback: Optional[ProgressCallback] = None
+    ) -> None:
+        """每个规格单独运行一个 FFmpeg，最多 4 个同时运行
+        
+        单个编码器用不满多路 CPU 时（或各规格无法放进同一个滤镜图时），
+        作为 transcode_multi 的替代。
+        
+        Args:
+            input_path: 输入视频路径
+            targets: (转码规格, 输出视频路径) 列表
+            progress_callback: 可选的进度回调对象
+            
+        Raises:
+            FFmpegError: 任一规格转码失败时
+        """
+        if len(targets) <= 1:
+            for spec, output_path in targets:
+                self.transcode(input_path, output_path, spec, progress_callback)
+            return
+        
+        with ThreadPoolExecutor(max_workers=min(len(targets), 4)) as executor:
+            futures = [
+                executor.submit(self.transcode, input_path, output_path, spec, progress_callback)
+                for spec, output_path in targets
+            ]
+            for future in futures:
+                future.result()
+    
     def should_skip_spec(
         self, 
         input_resolution: Tuple[int, int], 
@@ -126,6 +353,53 @@ class VideoTranscoder(VideoProcessor):
         # 这样可以避免将低分辨率视频放大到高分辨率
         return input_height < target_spec.height
     
+    def should_remux_spec(
+        self,
+        input_info: Dict[str, Any],
+        target_spec: TranscodeSpec
+    ) -> bool:
+        """判断该规格是否可以直接复制视频流（不重新编码）
+        
+        以下条件全部满足时，重新编码只会耗费 CPU 并损失画质，直接封装即可：
+        
+        - 输入是 8 位 yuv420p 的 H.264（10 位等格式播放端不一定支持）
+        - 高度不低于目标高度（与 should_skip_spec 一致，不把较低分辨率
+          当作该规格输出），宽高超出目标不超过 REMUX_TOLERANCE
+        - 视频码率已知且不高于 REMUX_MAX_BITRATES 中该规格的上限
+        
+        Args:
+            input_info: 输入视频信息（get_video_info 的返回值）
+            target_spec: 目标转码规格
+            
+        Returns:
+            是否直接复制视频流
+        """
+        if input_info.get('codec') != 'h264' or input_info.get('pix_fmt') != 'yuv420p':
+            return False
+        
+        limit = 1 + self.REMUX_TOLERANCE
+        height = input_info['height']
+        if not target_spec.height <= height <= target_spec.height * limit:
+            return False
+        if input_info['width'] > target_spec.width * limit:
+            return False
+        
+        max_bitrate = self.REMUX_MAX_BITRATES.get(target_spec.resolution_name)
+        bitrate = input_info.get('video_bitrate', 0)
+        return max_bitrate is not None and 0 < bitrate <= max_bitrate
+    
+    def remux(self, input_path: Path, output_path: Path) -> None:
+        """不重新编码，直接把输入的音视频流封装到输出文件
+        
+        Args:
+            input_path: 输入视频路径
+            output_path: 输出视频路径
+            
+        Raises:
+            FFmpegError: 当执行失败时
+        """
+        self.ffmpeg.execute(self.ffmpeg.build_remux_command(input_path, output_path))
+    
     def process(
         self, 
         drama_dir: Path, 
@@ -140,7 +414,7 @@ class VideoTranscoder(VideoProcessor):
         Returns:
             处理结果对象
         """
-        start_time = time.time()
+        start_time = time.monotonic()
         
         try:
             # 检查 cleared/ 目录是否存在
@@ -153,11 +427,11 @@ class VideoTranscoder(VideoProcessor):
                     input_path=drama_dir,
                     output_path=None,
                     error_message=error_msg,
-                    duration_seconds=time.time() - start_time
+                    duration_seconds=time.monotonic() - start_time
                 )
             
-            # 查找视频文件
-            video_files = list(cleared_dir.glob("*.mp4"))
+            # 查找视频文件和字幕文件
+            video_files, subtitle_files = _scan_cleared_dir(cleared_dir)
             if not video_files:
                 error_msg = f"cleared/ 目录中没有找到视频文件: {cleared_dir}"
                 self.logger.log_validation_error(drama_dir, error_msg)
@@ -166,14 +440,58 @@ class VideoTranscoder(VideoProcessor):
                     input_path=drama_dir,
                     output_path=None,
                     error_message=error_msg,
-                    duration_seconds=time.time() - start_time
+                    duration_seconds=time.monotonic() - start_time
                 )
             
             # 使用第一个视频文件
             input_video = video_files[0]
+        except Exception as e:
+            duration = time.monotonic() - start_time
+            error_msg = f"转码失败: {str(e)}"
+            self.logger.log_task_error("转码", drama_dir, e)
+            return ProcessingResult(
+                status=ProcessingStatus.FAILED,
+                input_path=drama_dir,
+                output_path=None,
+                error_message=error_msg,
+                duration_seconds=duration
+            )
+        
+        return self.process_video(
+            drama_dir, input_video, progress_callback, subtitle_files=subtitle_files
+        )
+    
+    def process_video(
+        self,
+        drama_dir: Path,
+        input_video: Path,
+        progress_callback: Optional[ProgressCallback] = None,
+        subtitle_files: Optional[List[Path]] = None
+    ) -> ProcessingResult:
+        """转码已知的视频文件，输出到短剧目录的 encoded/ 目录
+        
+        调用方已经知道要转码哪个视频时直接调用，不再扫描 cleared/ 目录
+        查找视频；process 在找到视频后也委托给本方法。
+        
+        Args:
+            drama_dir: 短剧目录路径
+            input_video: 待转码的视频文件路径
+            progress_callback: 可选的进度回调对象
+            subtitle_files: 需要一并复制到 encoded/ 的字幕文件；为 None 时
+                从视频所在目录查找 .srt 和 .ass 文件
+            
+        Returns:
+            处理结果对象
+        """
+        start_time = time.monotonic()
+        
+        try:
+            if subtitle_files is None:
+                subtitle_files = _scan_cleared_dir(input_video.parent)[1]
             
-            # 获取输入视频分辨率
-            input_resolution = self.get_video_resolution(input_video)
+            # 获取输入视频信息（分辨率、编码）
+            input_info = self.get_video_info(input_video)
+            input_resolution = (input_info['width'], input_info['height'])
             self.logger.logger.info(
                 f"输入视频分辨率: {input_resolution[0]}x{input_resolution[1]}"
             )
@@ -182,50 +500,77 @@ class VideoTranscoder(VideoProcessor):
             encoded_dir = drama_dir / "encoded"
             encoded_dir.mkdir(parents=True, exist_ok=True)
             
-            # 对每个规格进行转码
-            output_files = []
-            skipped_specs = []
+            # 输出文件命名：目录只列一次，名字被占用时加上本次运行的时间标记，
+            # 不再逐个 stat 带数字后缀的候选路径
+            existing_names = {entry.name for entry in os.scandir(encoded_dir)}
+            run_tag = time.strftime("%Y%m%d_%H%M%S")
+            
+            # 筛选需要转码的规格，所有规格在一次 FFmpeg 调用中完成；
+            # 与输入分辨率接近的 H.264 规格直接复制视频流
+            # output_files 与 self.specs 按下标一一对应，跳过的规格保持为 None
+            targets = []
+            remux_targets = []
+            output_files: List[Optional[Path]] = [None] * len(self.specs)
             
-            for spec in self.specs:
+            for i, spec in enumerate(self.specs):
+                remux = self.should_remux_spec(input_info, spec)
+                
                 # 检查是否应该跳过该规格
-                if self.should_skip_spec(input_resolution, spec):
-                    skipped_specs.append(spec.resolution_name)
+                if not remux and self.should_skip_spec(input_resolution, spec):
                     self.logger.logger.warning(
                         f"跳过 {spec.resolution_name} 规格 "
                         f"(输入分辨率 {input_resolution[1]}p 低于目标分辨率)"
                     )
                     continue
                 
-                # 生成输出文件名 - 使用唯一路径避免覆盖
+                # 生成输出文件名 - 名字被占用时加运行时间标记避免覆盖
                 output_filename = f"{input_video.stem}_{spec.resolution_name}.mp4"
-                output_path = self.file_manager.get_unique_path(encoded_dir / output_filename)
+                output_path = self._output_path(encoded_dir, output_filename, existing_names, run_tag)
+                output_files[i] = output_path
                 
-                self.logger.logger.info(
-                    f"开始转码到 {spec.resolution_name}: {output_path}"
-                )
-                
-                # 执行转码
-                self.transcode(input_video, output_path, spec, progress_callback)
-                output_files.append(output_path)
-                
-                self.logger.logger.info(
-                    f"完成转码到 {spec.resolution_name}: {output_path}"
-                )
+                if remux:
+                    remux_targets.append((spec, output_path))
+                    self.logger.logger.info(
+                        f"开始复制视频流到 {spec.resolution_name}: {output_path}"
+                    )
+                else:
+                    targets.append((spec, output_path))
+                    self.logger.logger.info(
+                        f"开始转码到 {spec.resolution_name}: {output_path}"
+                    )
             
-            # 复制字幕文件（如果存在）- 使用唯一路径避免覆盖
-            subtitle_files = list(cleared_dir.glob("*.srt")) + list(cleared_dir.glob("*.ass"))
+            # 执行转码
+            if self.fuse_outputs:
+                self.transcode_multi(input_video, targets, progress_callback)
+            else:
+                self._transcode_parallel(input_video, targets, progress_callback)
+            for _, output_path in remux_targets:
+                self.remux(input_video, output_path)
+            
+            for spec, output_path in zip(self.specs, output_files):
+                if output_path is not None:
+                    self.logger.logger.info(
+                        f"完成转码到 {spec.resolution_name}: {output_path}"
+                    )
+            
+            # 复制字幕文件（如果存在）- 与视频输出使用相同的命名规则避免覆盖
             for subtitle_file in subtitle_files:
-                dest_path = self.file_manager.get_unique_path(encoded_dir / subtitle_file.name)
+                dest_path = self._output_path(encoded_dir, subtitle_file.name, existing_names, run_tag)
                 self.file_manager.copy_file(subtitle_file, dest_path)
                 self.logger.logger.info(f"复制字幕文件: {subtitle_file.name}")
             
             # 记录跳过的规格
+            skipped_specs = [
+                spec.resolution_name
+                for spec, output_path in zip(self.specs, output_files)
+                if output_path is None
+            ]
             if skipped_specs:
                 self.logger.logger.info(
                     f"跳过的规格: {', '.join(skipped_specs)}"
                 )
             
-            duration = time.time() - start_time
+            duration = time.monotonic() - start_time
             self.logger.log_task_complete("转码", drama_dir, duration)
             
             return ProcessingResult(
@@ -237,7 +582,7 @@ class VideoTranscoder(VideoProcessor):
             )
             
         except FFmpegError as e:
-            duration = time.time() - start_time
+            duration = time.monotonic() - start_time
             error_msg = f"FFmpeg 错误: {str(e)}"
             self.logger.log_task_error("转码", drama_dir, e)
             return ProcessingResult(
@@ -248,7 +593,7 @@ class VideoTranscoder(VideoProcessor):
                 duration_seconds=duration
             )
         except Exception as e:
-            duration = time.time() - start_time
+            duration = time.monotonic() - start_time
             error_msg = f"转码失败: {str(e)}"
             self.logger.log_task_error("转码", drama_dir, e)
             return ProcessingResult(
@@ -266,27 +611,56 @@ class VideoTranscoder(VideoProcessor):
     ) -> List[ProcessingResult]:
         """批量处理多个短剧目录
         
+        最多 batch_workers 个目录同时转码，让单个 FFmpeg 用不满的
+        CPU 核处理其他目录。
+        
         Args:
             drama_dirs: 短剧目录路径列表
             progress_callback: 可选的进度回调对象
             
         Returns:
-            处理结果列表
+            处理结果列表，与输入目录一一对应
         """
-        results = []
         total = len(drama_dirs)
+        workers = min(self.batch_workers, total)
         
-        for i, drama_dir in enumerate(drama_dirs, 1):
+        if workers > 1 and progress_callback:
+            progress_callback = LockedProgressCallback(progress_callback)
+        
+        def process_single(item: Tuple[int, Path]) -> ProcessingResult:
+            i, drama_dir = item
             self.logger.logger.info(f"处理 {i}/{total}: {drama_dir}")
             
             if progress_callback:
                 progress_callback.on_file_start(str(drama_dir))
             
             result = self.process(drama_dir, progress_callback)
-            results.append(result)
             
             if progress_callback:
                 progress_callback.on_file_complete(result)
+            return result
+        
+        if workers <= 1:
+            # 转码当前目录时，后台线程预先探测下一个目录的视频信息，
+            # 处理到该目录时直接命中 get_video_info 的缓存
+            results = []
+            with ThreadPoolExecutor(max_workers=1) as prefetcher:
+                for i, drama_dir in enumerate(drama_dirs, 1):
+                    if i < total:
+                        prefetcher.submit(self._prefetch_video_info, drama_dirs[i])
+                    results.append(process_single((i, drama_dir)))
+        else:
+            # 实际工作在 FFmpeg 子进程中进行，线程只负责调度；
+            # process 内部捕获所有异常，map 按输入顺序返回结果。
+            # 未指定 threads 时，批量期间按同时运行的目录数平分 CPU 核
+            if self.threads is None:
+                self.ffmpeg.threads = max(1, (os.cpu_count() or 1) // workers)
+            try:
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    results = list(executor.map(process_single, enumerate(drama_dirs, 1)))
+            finally:
+                if self.threads is None:
+                    self.ffmpeg.threads = 0
         
         # 记录批量处理摘要
         success_count = sum(1 for r in results if r.status == ProcessingStatus.COMPLETED)
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+人声/伴奏混合一致性测试脚本
+
+检查内存混合（numpy + soundfile）和 FFmpeg amix 两条路径对同一组
+WAV 文件输出的响度一致。需要安装 numpy、soundfile 和 FFmpeg。
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+# 添加项目路径
+sys.path.insert(0, str(Path(__file__).parent))
+
+# 两条路径量化到 16 位时的舍入方式不同，允许的最大差值（16 位采样单位）
+TOLERANCE = 2
+
+
+def write_sample_wavs(directory: Path):
+    """生成 2 秒的人声/伴奏测试音频（44.1kHz 双声道）"""
+    import numpy as np
+    import soundfile as sf
+    
+    rate = 44100
+    t = np.arange(2 * rate) / rate
+    vocal = 0.6 * np.sin(2 * np.pi * 220 * t)
+    background = 0.8 * np.sin(2 * np.pi * 330 * t)
+    
+    vocal_path = directory / "vocals.wav"
+    background_path = directory / "accompaniment.wav"
+    sf.write(str(vocal_path), np.stack([vocal, vocal], axis=1), rate, subtype='PCM_16')
+    sf.write(str(background_path), np.stack([background, background], axis=1), rate, subtype='PCM_16')
+    return vocal_path, background_path
+
+
+def test_mix_paths_match():
+    """测试内存混合与 FFmpeg 混合的输出一致"""
+    print("=" * 70)
+    print("测试人声/伴奏混合一致性")
+    print("=" * 70)
+    
+    import numpy as np
+    import soundfile as sf
+    
+    from drama_processor.separator import AudioSeparator
+    
+    separator = AudioSeparator(backend='audio-separator')
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_dir = Path(tmp)
+        vocal_path, background_path = write_sample_wavs(tmp_dir)
+        
+        for bg_volume in (0.2, 1.0):
+            in_memory = tmp_dir / f"mixed_memory_{bg_volume}.wav"
+            ffmpeg = tmp_dir / f"mixed_ffmpeg_{bg_volume}.wav"
+            
+            assert separator._mix_wav_in_memory(vocal_path, background_path, in_memory, bg_volume)
+            separator._mix_audio_ffmpeg(vocal_path, background_path, ffmpeg, bg_volume)
+            
+            a, _ = sf.read(str(in_memory), dtype='int16', always_2d=True)
+            b, _ = sf.read(str(ffmpeg), dtype='int16', always_2d=True)
+            assert a.shape == b.shape, f"长度不一致: {a.shape} != {b.shape}"
+            diff = int(np.abs(a.astype(np.int32) - b.astype(np.int32)).max())
+            print(f"\n伴奏音量 {bg_volume}: 最大差值 {diff}")
+            assert diff <= TOLERANCE, f"两条路径的输出不一致（最大差值 {diff}）"
+    
+    print("\n" + "=" * 70)
+
+
+def main():
+    """主函数"""
+    try:
+        test_mix_paths_match()
+        
+        print("\n" + "*" * 70)
+        print("测试完成！")
+        print("*" * 70 + "\n")
+    
+    except Exception as e:
+        print(f"\n错误: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()